@@ -6,7 +6,6 @@ from streamlit_autorefresh import st_autorefresh
 import time
 import sqlite3
 import os
-import requests
 from dotenv import load_dotenv
 from data_store import store
 
@@ -22,13 +21,13 @@ st_autorefresh(interval=1000, key="data_refresh")
 # st.title("📊Dynamic Range Optimizer")
 # st.markdown("v4 Dynamic Liquidity Management Dashboard")
 
-@st.cache_data(ttl=2)
-def fetch_live_external_price():
-    """Fetch real-time price from MockV3Aggregator"""
+@st.cache_resource
+def get_oracle_contract():
+    """Build the Web3 connection + MockV3Aggregator contract once per session."""
     try:
         from web3 import Web3
         from config import CONTRACTS
-        
+
         # RPC priority: Base Sepolia > generic RPC_URL > Anvil local
         rpc_url = (
             os.getenv("BASE_SEPOLIA_RPC_URL")
@@ -37,11 +36,11 @@ def fetch_live_external_price():
             or "http://127.0.0.1:8545"
         )
         w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
+
         oracle_address = CONTRACTS.get('oracle')
         if not oracle_address:
             return None
-        
+
         oracle_abi = [
             {
                 "inputs": [],
@@ -65,15 +64,33 @@ def fetch_live_external_price():
             }
         ]
         
-        oracle = w3.eth.contract(
+        return w3.eth.contract(
             address=w3.to_checksum_address(oracle_address),
             abi=oracle_abi
         )
-        
+    except Exception:
+        return None
+
+@st.cache_resource
+def get_oracle_scale():
+    """decimals() never changes on the aggregator; fetch it once per session."""
+    oracle = get_oracle_contract()
+    if oracle is None:
+        return None
+    return 10 ** oracle.functions.decimals().call()
+
+@st.cache_data(ttl=2)
+def fetch_live_external_price():
+    """Fetch real-time price from MockV3Aggregator"""
+    try:
+        oracle = get_oracle_contract()
+        scale = get_oracle_scale()
+        if oracle is None or scale is None:
+            return None
+
         round_id, answer, started_at, updated_at, answered_in_round = oracle.functions.latestRoundData().call()
-        decimals = oracle.functions.decimals().call()
-        price = float(answer) / (10 ** decimals)
-        
+        price = float(answer) / scale
+
         return price
     except Exception as e:
         return None
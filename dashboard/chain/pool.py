@@ -31,47 +31,73 @@ def compute_pool_id(
     return Web3.keccak(encoded)
 
 
-def fetch_slot0(pool_manager, pool_id: bytes) -> Optional[dict]:
-    """Read pool state from PoolManager via extsload (with getSlot0 fallback).
+# Storage slot of PoolManager's `_pools` mapping.
+POOLS_SLOT = b"\x00" * 31 + b"\x06"
+
+
+def slot0_storage_slot(pool_id: bytes) -> bytes:
+    """Storage slot of a pool's packed Slot0 word (first word of Pool.State)."""
+    return Web3.keccak(pool_id + POOLS_SLOT)
+
+
+def liquidity_storage_slot(pool_id: bytes) -> bytes:
+    """Storage slot of a pool's active liquidity (Slot0 slot + 3)."""
+    return (int.from_bytes(slot0_storage_slot(pool_id), "big") + 3).to_bytes(32, "big")
+
+
+def decode_slot0_word(value: bytes) -> Optional[dict]:
+    """Decode a raw Slot0 storage word (e.g. an extsload return value).
 
     Returns a dict with keys: sqrtPriceX96, tick, price, protocolFee, lpFee.
-    Returns None if the pool is uninitialised or an error occurs.
+    Returns None if the word does not look like an initialised pool's Slot0.
     """
-    try:
-        pools_slot = b"\x00" * 31 + b"\x06"
-        slot = Web3.keccak(pool_id + pools_slot)
-        value = pool_manager.functions.extsload(slot).call()
-        data = int.from_bytes(value, byteorder="big")
+    data = int.from_bytes(value, byteorder="big")
 
-        if data == 0:
-            return None
+    if data == 0:
+        return None
 
-        sqrt_price_x96 = data & 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF
-        if sqrt_price_x96 == 0 or sqrt_price_x96 > (1 << 160) - 1:
-            return None
+    sqrt_price_x96 = data & 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF
+    if sqrt_price_x96 == 0 or sqrt_price_x96 > (1 << 160) - 1:
+        return None
 
-        tick_raw = (data >> 160) & 0xFFFFFF
-        tick = tick_raw - (1 << 24) if tick_raw & (1 << 23) else tick_raw
+    tick_raw = (data >> 160) & 0xFFFFFF
+    tick = tick_raw - (1 << 24) if tick_raw & (1 << 23) else tick_raw
 
-        if not (-887272 <= tick <= 887272):
-            return None
+    if not (-887272 <= tick <= 887272):
+        return None
 
-        price = (sqrt_price_x96 / (2**96)) ** 2
+    price = (sqrt_price_x96 / (2**96)) ** 2
+    if price <= 0 or price > 1e10:
+        price = 1.0001**tick
         if price <= 0 or price > 1e10:
-            price = 1.0001**tick
-            if price <= 0 or price > 1e10:
-                return None
+            return None
 
-        protocol_fee = (data >> 184) & 0xFFFFFF
-        lp_fee = (data >> 208) & 0xFFFFFF
+    protocol_fee = (data >> 184) & 0xFFFFFF
+    lp_fee = (data >> 208) & 0xFFFFFF
 
-        return {
-            "sqrtPriceX96": sqrt_price_x96,
-            "tick": tick,
-            "price": price,
-            "protocolFee": protocol_fee,
-            "lpFee": lp_fee,
-        }
+    return {
+        "sqrtPriceX96": sqrt_price_x96,
+        "tick": tick,
+        "price": price,
+        "protocolFee": protocol_fee,
+        "lpFee": lp_fee,
+    }
+
+
+def decode_liquidity_word(value: bytes) -> int:
+    """Decode a raw liquidity storage word to the uint128 active liquidity."""
+    return int.from_bytes(value, "big") & ((1 << 128) - 1)
+
+
+def fetch_slot0(pool_manager, pool_id: bytes) -> Optional[dict]:
+    """Read pool state from PoolManager via extsload (with getSlot0 fallback).
+
+    Returns a dict with keys: sqrtPriceX96, tick, price, protocolFee, lpFee.
+    Returns None if the pool is uninitialised or an error occurs.
+    """
+    try:
+        value = pool_manager.functions.extsload(slot0_storage_slot(pool_id)).call()
+        return decode_slot0_word(value)
     except Exception:
         pass
 
@@ -97,11 +123,8 @@ def fetch_slot0(pool_manager, pool_id: bytes) -> Optional[dict]:
 def fetch_liquidity(pool_manager, pool_id: bytes) -> Optional[int]:
     """Fetch total active liquidity from PoolManager storage."""
     try:
-        pools_slot = b"\x00" * 31 + b"\x06"
-        state_slot = Web3.keccak(pool_id + pools_slot)
-        liquidity_slot = (int.from_bytes(state_slot, "big") + 3).to_bytes(32, "big")
-        value = pool_manager.functions.extsload(liquidity_slot).call()
-        return int.from_bytes(value, "big") & ((1 << 128) - 1)
+        value = pool_manager.functions.extsload(liquidity_storage_slot(pool_id)).call()
+        return decode_liquidity_word(value)
     except Exception:
         return None
 
@@ -28,8 +28,9 @@ load_dotenv()
 
 class MPPIBot:
     def __init__(self):
-        self.device = torch.device("cpu")
-        self.dtype = torch.float32
+        # Rollouts run on GPU when one is present; state fetch/tx plumbing stays on CPU.
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.dtype = MPPI_CONFIG["dtype"]
 
         self.rpc_url = get_rpc_url()
         self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
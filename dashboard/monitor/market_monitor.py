@@ -34,6 +34,13 @@ class MarketMonitor:
 
         self.history = []
 
+        # Oracle contract is built lazily once; re-creating it per fetch paid
+        # the contract-wrapper construction cost on every poll. decimals() is
+        # immutable on the aggregator, so its scale is cached alongside —
+        # one RPC per price instead of two.
+        self._oracle = None
+        self._oracle_scale = None
+
     # ------------------------------------------------------------------
     # Price / tick helpers
     # ------------------------------------------------------------------
@@ -63,17 +70,19 @@ class MarketMonitor:
     def fetch_mock_oracle_price(self) -> float | None:
         """Fetch price from MockV3Aggregator oracle."""
         try:
-            oracle_address = CONTRACTS.get("oracle")
-            if not oracle_address:
-                return None
-
-            oracle = self.w3.eth.contract(
-                address=self.w3.to_checksum_address(oracle_address),
-                abi=ORACLE_ABI,
-            )
+            if self._oracle is None:
+                oracle_address = CONTRACTS.get("oracle")
+                if not oracle_address:
+                    return None
+                self._oracle = self.w3.eth.contract(
+                    address=self.w3.to_checksum_address(oracle_address),
+                    abi=ORACLE_ABI,
+                )
+            oracle = self._oracle
+            if self._oracle_scale is None:
+                self._oracle_scale = 10 ** oracle.functions.decimals().call()
             _, answer, _, _, _ = oracle.functions.latestRoundData().call()
-            decimals = oracle.functions.decimals().call()
-            return float(answer) / (10**decimals)
+            return float(answer) / self._oracle_scale
         except Exception as e:
             print(f"Error fetching mock oracle price: {e}", flush=True)
             return None
@@ -0,0 +1,40 @@
+"""
+Canonical MPPI optimizer package.
+
+Import the dynamics/cost/controller from here (one import path) so
+torch.compile / TorchScript caches are shared by all callers instead of
+being re-specialized per duplicate module path.
+"""
+
+from .config_for_mppi import MPPI_CONFIG
+from .controller import S_MPPI
+from .cost_function import stage_cost, terminal_cost
+from .rebalancer import MPPIRebalancer
+from .utils import (
+    PoolStateSoA,
+    clamp_and_align,
+    clamp_ticks,
+    generate_constant_parameter_seq,
+    generate_jump_diffusion_parameter_seq,
+    generate_random_parameter_seq,
+    price_to_tick,
+    tick_to_price,
+    uniswap_dynamics,
+)
+
+__all__ = [
+    "MPPI_CONFIG",
+    "S_MPPI",
+    "MPPIRebalancer",
+    "PoolStateSoA",
+    "clamp_and_align",
+    "clamp_ticks",
+    "generate_constant_parameter_seq",
+    "generate_jump_diffusion_parameter_seq",
+    "generate_random_parameter_seq",
+    "price_to_tick",
+    "stage_cost",
+    "terminal_cost",
+    "tick_to_price",
+    "uniswap_dynamics",
+]
@@ -13,4 +13,9 @@ MPPI_CONFIG = {
     "u_max": torch.tensor([600.0, 1200.0]),
     "sigmas": torch.tensor([120.0, 240.0]),
     "lambda_": 1.0,
+    # Rollout dtype. Must stay fp32: torch.inverse and the MultivariateNormal
+    # Cholesky in S_MPPI.__init__ reject bf16, and the bot's state is absolute
+    # ticks (~78k at price 2500) where bf16's 512-tick ulp is coarser than the
+    # 60/120-tick rebalance deadband.
+    "dtype": torch.float32,
 }
\ No newline at end of file
@@ -11,6 +11,8 @@ import torch
 import torch.nn as nn
 from torch.distributions.multivariate_normal import MultivariateNormal
 
+from .utils import PoolStateSoA
+
 
 class S_MPPI(nn.Module):
     """
@@ -117,7 +119,8 @@ class S_MPPI(nn.Module):
             zero_mean_seq + self._action_noises, self._u_min, self._u_max
         )
 
-        self._previous_action_seq = zero_mean_seq
+        # leading dim = number of pools being optimized in one batch (1 by default)
+        self._previous_action_seq = zero_mean_seq.unsqueeze(0)
 
         # inner variables
         self._state_seq_batch = torch.zeros(
@@ -133,115 +136,174 @@ class S_MPPI(nn.Module):
         self._random_parameter_seq = torch.zeros(
             self._num_samples_expect, self._horizon
         )
+        # SoA rollout buffer, allocated on first forward_batch (its leading
+        # dim is the pool batch size) and reused across iterations.
+        self._state_soa = None
+
 ##################################################################################33
 ###############                     main                     ################3
 #################################################################################33
+    @property
+    def device(self) -> torch.device:
+        return self._device
+
     def forward(self, state: torch.Tensor) -> Tuple[Tuple[torch.Tensor, torch.Tensor], float]:#forwardにstate歯科引数がなくても、事前入力系列は更新され続ける。インスタンスが作られたあと、インスタンスが存在する限り値が保持され更新され続ける
         assert state.shape == (self._dim_state,)
 
         if not torch.is_tensor(state):
             state = torch.tensor(state, device=self._device, dtype=self._dtype)
             #pythonにおけるテンソルとはpytorchが提供している特殊な型。テンソル型はGPUを用いて演算が可能。行列みたいなもの
-        else:
-            if state.device != self._device or state.dtype != self._dtype:
-                state = state.to(self._device, self._dtype)
 
-        mean_action_seq = self._previous_action_seq.clone().detach() #(self._horizon, self._dim_control)
+        current_actions, optimal_action_seqs = self.forward_batch(state.unsqueeze(0))
+        return current_actions[0], optimal_action_seqs[0]
+
+    def forward_batch(self, states: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Optimize a batch of pools in one rollout.
+
+        :param states: (num_pools, dim_state) initial state per pool.
+        :return: (current_actions, optimal_action_seqs) of shapes
+            (num_pools, dim_control) and (num_pools, horizon, dim_control).
+
+        The sampled action noise and random parameter sequences are shared
+        across pools, so the fixed MPPI overhead (RNG, kernel launches) is paid
+        once instead of once per pool.
+        """
+        assert states.dim() == 2 and states.shape[1] == self._dim_state
+        num_pools = states.shape[0]
+
+        if states.device != self._device or states.dtype != self._dtype:
+            states = states.to(self._device, self._dtype)
+
+        # warm-start mean per pool; re-initialize when the batch size changes
+        if self._previous_action_seq.shape[0] != num_pools:
+            self._previous_action_seq = torch.zeros(
+                num_pools, self._horizon, self._dim_control,
+                device=self._device, dtype=self._dtype,
+            )
+        # receding-horizon shift: the first action of the previous optimum has
+        # been executed, so drop it and repeat the tail — the shifted sequence
+        # is a much better sampling mean than the unshifted one and cuts the
+        # samples needed for convergence.
+        mean_action_seq = torch.cat(
+            [self._previous_action_seq[:, 1:], self._previous_action_seq[:, -1:]], dim=1
+        ).detach() #(num_pools, self._horizon, self._dim_control)
         #self._previous_action_seqは前のステップで使用された入力系列を保持するテンソル。それをcone()でコピーし、新しいテンソルを生成する。detachでは新しく生成されたテンソルをpytochの自動勾配計算システムから独立させている
 
         # random sampling with reparametrization trick
         self._action_noises = self._noise_distribution.rsample(#(self._num_samples, self._horizon)
             sample_shape=self._sample_shape
         )
-        self._perturbed_action_seqs = mean_action_seq + self._action_noises#ブロードキャスト
+        self._perturbed_action_seqs = mean_action_seq.unsqueeze(1) + self._action_noises#ブロードキャスト -> (num_pools, num_samples, horizon, dim_control)
         # clamp actions 入力を特定の領域にクリッピングしている。範囲外の値は最小値化最大値に置き換えられる。
         self._perturbed_action_seqs = torch.clamp(
             self._perturbed_action_seqs, self._u_min, self._u_max
         )
-        self._perturbed_action_seqs_exp = self._perturbed_action_seqs.unsqueeze(1).repeat(1, self._num_samples_expect, 1, 1)
+        self._perturbed_action_seqs_exp = self._perturbed_action_seqs.unsqueeze(2).repeat(1, 1, self._num_samples_expect, 1, 1)
         # rollout samples in parallel
-        self._state_seq_batch[:, 0, :] = state.repeat(self._num_samples, 1)#各サンプルの状態系列を保持するテンソルを初期化している。#与えられた初期状態stateをサンプルの数だけ繰り返して、すべてのsンプルが同じ初期状態から開始するようにしている。
-        self._state_seq_batch_exp = self._state_seq_batch.unsqueeze(1).repeat(1, self._num_samples_expect,1,1)
-        
+        self._state_seq_batch[:, 0, :] = states[0].repeat(self._num_samples, 1)#各サンプルの状態系列を保持するテンソルを初期化している。#与えられた初期状態stateをサンプルの数だけ繰り返して、すべてのsンプルが同じ初期状態から開始するようにしている。
+        # SoA rollout buffer: one contiguous channel per state dimension so the
+        # dynamics reads/writes unit-stride streams (no state[..., i] gathers).
+        # Allocated once and rewritten in place each iteration.
+        if (
+            self._state_soa is None
+            or self._state_soa.t_market.shape[0] != num_pools
+        ):
+            self._state_soa = PoolStateSoA.empty(
+                (num_pools, self._num_samples, self._num_samples_expect),
+                self._horizon, self._device, self._dtype,
+            )
+        self._state_soa.t_market[..., 0] = states[:, 0].view(num_pools, 1, 1)
+        self._state_soa.t_pool[..., 0] = states[:, 1].view(num_pools, 1, 1)
+        self._state_soa.t_center[..., 0] = states[:, 2].view(num_pools, 1, 1)
+        self._state_soa.w_ticks[..., 0] = states[:, 3].view(num_pools, 1, 1)
+
         #期待値計算のために確率過程を生成
         if self._PROPOSE == True:
             self._random_parameter_seq = self._generate_random_parameter_seq(self._num_samples_expect, self._horizon, self._device, self._dtype)
         else:
             self._random_parameter_seq = self._generate_constant_parameter_seq(self._num_samples_expect, self._horizon, self._device, self._dtype)
-        
-        self._random_parameter_seq_batch = self._random_parameter_seq.unsqueeze(0).repeat(self._num_samples,1,1)
+
+        self._random_parameter_seq_batch = self._random_parameter_seq.view(
+            1, 1, self._num_samples_expect, self._horizon
+        ).repeat(num_pools, self._num_samples, 1, 1)
 ###################### cal state and cost ###################################
         # 時間発展の計算
         for t in range(self._horizon):
-            self._state_seq_batch_exp[:, :, t + 1, :] = self._dynamics(
-                self._state_seq_batch_exp[:, :, t, :], 
-                self._perturbed_action_seqs_exp[:, :, t, :], 
-                self._random_parameter_seq_batch[:, :, t]
+            next_state = self._dynamics(
+                self._state_soa.at(t),
+                self._perturbed_action_seqs_exp[:, :, :, t, :],
+                self._random_parameter_seq_batch[..., t]
             )
+            self._state_soa.t_market[..., t + 1] = next_state[0]
+            self._state_soa.t_pool[..., t + 1] = next_state[1]
+            self._state_soa.t_center[..., t + 1] = next_state[2]
+            self._state_soa.w_ticks[..., t + 1] = next_state[3]
 
         # ステージコスト・アクションコストの計算
         stage_costs_exp = torch.zeros(
-            self._num_samples, self._num_samples_expect, self._horizon, 
+            num_pools, self._num_samples, self._num_samples_expect, self._horizon,
             device=self._device, dtype=self._dtype
         )
         action_costs_exp = torch.zeros(
-            self._num_samples, self._num_samples_expect, self._horizon, 
+            num_pools, self._num_samples, self._num_samples_expect, self._horizon,
             device=self._device, dtype=self._dtype
         )
 
+        # (num_pools, horizon, dim_control) @ (dim_control, dim_control)
+        mean_inv_cov = mean_action_seq @ self._inv_covariance
+
         for t in range(self._horizon):
-            stage_costs_exp[:, :, t] = self._stage_cost(
-                self._state_seq_batch_exp[:, :, t, :], 
-                self._perturbed_action_seqs_exp[:, :, t, :]
-            )
-            action_costs_exp[:, :, t] = (
-                mean_action_seq[t]
-                @ self._inv_covariance
-                @ self._perturbed_action_seqs_exp[:, :, t].transpose(-1, -2)
+            stage_costs_exp[..., t] = self._stage_cost(
+                self._state_soa.at(t),
+                self._perturbed_action_seqs_exp[:, :, :, t, :]
             )
+            action_costs_exp[..., t] = (
+                mean_inv_cov[:, None, None, t, :]
+                * self._perturbed_action_seqs_exp[:, :, :, t, :]
+            ).sum(dim=-1)
 
         # 終端コストの計算
-        terminal_costs_exp = self._terminal_cost(self._state_seq_batch_exp[:, :, -1, :])
+        terminal_costs_exp = self._terminal_cost(self._state_soa.at(self._horizon))
 
-        # `num_samples_expect` 
-        stage_costs = stage_costs_exp.mean(dim=1)  # (num_samples, horizon)
-        action_costs = action_costs_exp.mean(dim=1)  # (num_samples, horizon)
-        terminal_costs = terminal_costs_exp.mean(dim=1)  # (num_samples,)
+        # `num_samples_expect`
+        stage_costs = stage_costs_exp.mean(dim=2)  # (num_pools, num_samples, horizon)
+        action_costs = action_costs_exp.mean(dim=2)  # (num_pools, num_samples, horizon)
+        terminal_costs = terminal_costs_exp.mean(dim=2)  # (num_pools, num_samples)
 
         # 総コストの計算
         costs = (
-            torch.sum(stage_costs, dim=1)  # 時間方向に合計
+            torch.sum(stage_costs, dim=2)  # 時間方向に合計
             + terminal_costs
-            + torch.sum(self._lambda * action_costs, dim=1)
+            + torch.sum(self._lambda * action_costs, dim=2)
         )
 
         ######################## cal weight ##################################
-        # calculate weights
-        self._weights = torch.softmax(-costs / self._lambda, dim=0)
+        # calculate weights (per pool, over samples)
+        # softmax and the weighted sum are numerically sensitive: run them in
+        # fp32 even when the rollout uses a reduced dtype (bf16/fp16).
+        self._weights = torch.softmax(-costs.float() / self._lambda, dim=1)
 
         # find optimal control by weighted average
-        optimal_action_seq = torch.sum(
-            self._weights.view(self._num_samples, 1, 1) * self._perturbed_action_seqs,
-            dim=0,
-        )
+        optimal_action_seqs = torch.sum(
+            self._weights.view(num_pools, self._num_samples, 1, 1) * self._perturbed_action_seqs.float(),
+            dim=1,
+        ).to(self._dtype)
 
         # update previous actions
-        self._previous_action_seq = optimal_action_seq
+        self._previous_action_seq = optimal_action_seqs
 
         # Hysteresis / Deadband (tick-based)
         # control action 0: Δtick_center, action 1: Δwidth_ticks
         threshold_center = 60.0   # ~1 tickSpacing
         threshold_width = 120.0   # ~2 tickSpacing
 
-        current_action = optimal_action_seq[0] # The action to be applied now
-        
-        if abs(current_action[0]) < threshold_center:
-            current_action[0] = 0.0
-        
-        if abs(current_action[1]) < threshold_width:
-            current_action[1] = 0.0
-            
-        return current_action, optimal_action_seq # Return both immediate action and full sequence
+        current_actions = optimal_action_seqs[:, 0] # The actions to be applied now
+
+        current_actions[:, 0][current_actions[:, 0].abs() < threshold_center] = 0.0
+        current_actions[:, 1][current_actions[:, 1].abs() < threshold_width] = 0.0
+
+        return current_actions, optimal_action_seqs # Return both immediate actions and full sequences
 #########################################################################################33
 #########################################################################################
     def get_top_samples(self, num_samples: int) -> Tuple[torch.Tensor, torch.Tensor]:
@@ -254,11 +316,12 @@ class S_MPPI(nn.Module):
         """
         assert num_samples <= self._num_samples
 
-        # large weights are better
-        top_indices = torch.topk(self._weights, num_samples).indices #indecesはindexの複数形
+        # large weights are better (weights are per pool; inspect pool 0)
+        weights = self._weights[0] if self._weights.dim() == 2 else self._weights
+        top_indices = torch.topk(weights, num_samples).indices #indecesはindexの複数形
 
         top_samples = self._state_seq_batch[top_indices]
-        top_weights = self._weights[top_indices]
+        top_weights = weights[top_indices]
 
         top_samples = top_samples[torch.argsort(top_weights, descending=True)] #取り出した上位数個の重みとサンプルを重み順に並び変える
         top_weights = top_weights[torch.argsort(top_weights, descending=True)]
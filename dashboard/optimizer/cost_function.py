@@ -1,14 +1,11 @@
 import torch
 
-def stage_cost(state: torch.Tensor, action: torch.Tensor) -> torch.Tensor:
+def stage_cost(state, action: torch.Tensor) -> torch.Tensor:
     """
-    state: (..., 4) -> [t_market, t_pool, t_center, width_ticks]
+    state: 4-tuple of (...,) channels [t_market, t_pool, t_center, width_ticks]
     action: (..., 2)
     """
-    t_market = state[..., 0]
-    t_pool = state[..., 1]
-    t_center = state[..., 2]
-    w_ticks = state[..., 3]
+    t_market, t_pool, t_center, w_ticks = state
 
     lower = t_center - (w_ticks / 2)
     upper = t_center + (w_ticks / 2)
@@ -42,13 +39,11 @@ def stage_cost(state: torch.Tensor, action: torch.Tensor) -> torch.Tensor:
         + rebalance_cost
     )
 
-def terminal_cost(state: torch.Tensor) -> torch.Tensor:
+def terminal_cost(state) -> torch.Tensor:
     """
-    state: (..., 4) -> [t_market, t_pool, t_center, width_ticks]
+    state: 4-tuple of (...,) channels [t_market, t_pool, t_center, width_ticks]
     """
-    t_market = state[..., 0]
-    t_center = state[..., 2]
-    w_ticks = state[..., 3]
+    t_market, _, t_center, w_ticks = state
 
     dist_cost = 5e-5 * torch.pow((t_market - t_center), 2)
     width_penalty = 1e-4 * w_ticks
@@ -7,12 +7,16 @@ from .utils import (
     generate_jump_diffusion_parameter_seq,
     generate_constant_parameter_seq,
     price_to_tick,
-    clamp_ticks,
+    clamp_and_align,
     tick_to_price,
 )
 
 class MPPIRebalancer:
-    def __init__(self, device: str = "cpu"):
+    def __init__(self, device: str | None = None):
+        # MPPI rollouts are embarrassingly parallel; default to CUDA when
+        # available and keep only the scalar plumbing on CPU.
+        if device is None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
         cfg = MPPI_CONFIG
         self.controller = S_MPPI(
             PROPOSE=cfg["PROPOSE"],
@@ -32,6 +36,21 @@ class MPPIRebalancer:
             sigmas=cfg["sigmas"],
             lambda_=cfg["lambda_"],
             device=torch.device(device),
+            dtype=cfg["dtype"],
+        )
+        # Reused state buffers: compute_action fills the host buffer in place
+        # (pinned when the controller is on CUDA so the upload can overlap)
+        # and copies into a persistent device twin — no per-call allocation
+        # and no implicit blocking H2D transfer inside the controller.
+        device = self.controller.device
+        self._h_state = torch.empty(
+            cfg["dim_state"], dtype=torch.float32,
+            pin_memory=(device.type == "cuda"),
+        )
+        self._d_state = (
+            torch.empty(cfg["dim_state"], dtype=torch.float32, device=device)
+            if device.type == "cuda"
+            else self._h_state
         )
 
     @staticmethod
@@ -60,15 +79,31 @@ class MPPIRebalancer:
         p_center = (price_lower + price_upper) / 2.0
         width = max(0.01, price_upper - price_lower)
 
-        state = torch.tensor(
-            [float(external_price), float(pool_price), float(p_center), float(width)],
-            dtype=torch.float32,
-        )
+        state = self._h_state
+        state[0] = float(external_price)
+        state[1] = float(pool_price)
+        state[2] = p_center
+        state[3] = width
+        if self._d_state is not self._h_state:
+            self._d_state.copy_(state, non_blocking=True)
 
-        current_action, _ = self.controller.forward(state)
-        delta_center = float(current_action[0].item())
-        delta_width = float(current_action[1].item())
-        return delta_center, delta_width
+        current_action = self.compute_action_batch(self._d_state.unsqueeze(0))[0]
+        # one host transfer instead of one .item() sync per component
+        arr = current_action.detach().cpu().numpy()
+        return float(arr[0]), float(arr[1])
+
+    def compute_action_batch(self, states: torch.Tensor) -> torch.Tensor:
+        """
+        Vectorized variant of compute_action for N pools at once.
+
+        states: (N, 4) rows of [P_market, P_pool, P_center, width]
+        returns: (N, 2) immediate actions [ΔP_center, Δwidth] per pool.
+
+        All pools share one controller rollout, so the fixed MPPI overhead
+        (sampling, kernel launches) is paid once rather than N times.
+        """
+        current_actions, _ = self.controller.forward_batch(states)
+        return current_actions
 
     def compute_target_range(
         self,
@@ -101,11 +136,6 @@ class MPPIRebalancer:
 
         tick_lower = price_to_tick(lower_price)
         tick_upper = price_to_tick(upper_price)
-        tick_lower, tick_upper = clamp_ticks(tick_lower, tick_upper)
-
-        tick_lower = self._truncate_tick(tick_lower, tick_spacing)
-        tick_upper = self._truncate_tick(tick_upper, tick_spacing)
-        if tick_lower >= tick_upper:
-            tick_upper = tick_lower + tick_spacing
+        tick_lower, tick_upper = clamp_and_align(tick_lower, tick_upper, tick_spacing)
 
         return int(tick_lower), int(tick_upper)
\ No newline at end of file
@@ -1,26 +1,124 @@
+import functools
 import math
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
 import torch
 
+# NumPy's PCG64 is markedly faster than torch's CPU RNG at the (N, H) sizes
+# drawn here; used as a zero-copy fast path when sampling on CPU in float32.
+_cpu_rng = np.random.default_rng()
+
 def price_to_tick(price: float) -> int:
     return int(round(math.log(price) / math.log(1.0001)))
 
+# Ticks are aligned to tick_spacing and cluster around the current price, so
+# the same handful of values recurs every rebalance loop; cache the pow.
+@functools.lru_cache(maxsize=16384)
 def tick_to_price(tick: int) -> float:
     return 1.0001 ** tick
 
+MIN_TICK, MAX_TICK = -887272, 887272
+
 def clamp_ticks(tick_lower: int, tick_upper: int) -> tuple[int, int]:
-    from math import floor, ceil
-    MIN_TICK, MAX_TICK = -887272, 887272
     tick_lower = max(MIN_TICK, min(tick_lower, tick_upper - 1))
     tick_upper = min(MAX_TICK, max(tick_upper, tick_lower + 1))
     return tick_lower, tick_upper
 
+@functools.lru_cache(maxsize=4096)
+def clamp_and_align(tick_lower: int, tick_upper: int, tick_spacing: int) -> tuple[int, int]:
+    """
+    Normalize a (lower, upper) pair in one call: order the bounds, clamp to
+    the global tick range, and align both to tick_spacing. Fuses the
+    clamp_ticks + per-bound truncate chain into a single cached Python frame;
+    the same (lower, upper, spacing) triples repeat across rebalance loops.
+    """
+    tick_lower = max(MIN_TICK, min(tick_lower, tick_upper - 1))
+    tick_upper = min(MAX_TICK, max(tick_upper, tick_lower + 1))
+    tick_lower = (tick_lower // tick_spacing) * tick_spacing
+    tick_upper = (tick_upper // tick_spacing) * tick_spacing
+    if tick_lower >= tick_upper:
+        tick_upper = tick_lower + tick_spacing
+    return tick_lower, tick_upper
+
 def generate_random_parameter_seq(num_samples_expect, horizon, device, dtype):
+    if device.type == "cpu" and dtype == torch.float32:
+        arr = _cpu_rng.standard_normal((num_samples_expect, horizon), dtype=np.float32)
+        return torch.from_numpy(arr)
     return torch.randn(num_samples_expect, horizon, device=device, dtype=dtype)
 
 def generate_constant_parameter_seq(num_samples_expect, horizon, device, dtype):
     return torch.zeros(num_samples_expect, horizon, device=device, dtype=dtype)
 
-def generate_jump_diffusion_parameter_seq(
+@dataclass
+class PoolStateSoA:
+    """
+    SoA rollout buffer: one contiguous (*batch_shape, horizon+1) tensor per
+    state channel instead of a single (..., 4) AoS tensor.
+
+    Slicing state[..., i] out of an AoS tensor produces strided views and the
+    dynamics has to re-stack its outputs every step; per-channel tensors make
+    every elementwise op a unit-stride stream. Convert back to AoS only at the
+    boundary via stack().
+    """
+    t_market: torch.Tensor
+    t_pool: torch.Tensor
+    t_center: torch.Tensor
+    w_ticks: torch.Tensor
+
+    @classmethod
+    def empty(cls, batch_shape, horizon, device, dtype) -> "PoolStateSoA":
+        shape = (*batch_shape, horizon + 1)
+        return cls(*(torch.empty(shape, device=device, dtype=dtype) for _ in range(4)))
+
+    def at(self, t: int) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Channel views at horizon step t, in the order uniswap_dynamics expects."""
+        return (
+            self.t_market[..., t],
+            self.t_pool[..., t],
+            self.t_center[..., t],
+            self.w_ticks[..., t],
+        )
+
+    def stack(self) -> torch.Tensor:
+        """Materialize the AoS (*batch_shape, horizon+1, 4) view."""
+        return torch.stack([self.t_market, self.t_pool, self.t_center, self.w_ticks], dim=-1)
+
+
+def _compile_kernel(fn):
+    """
+    Best-effort torch.compile for the hot rollout kernels.
+
+    Shapes are fixed by MPPI_CONFIG at steady state, so dynamic=False lets
+    Inductor specialize once and fuse the elementwise chain into a single
+    read/write pass per state channel. Falls back to eager permanently if
+    compilation is unavailable (old torch, missing toolchain) or fails on
+    the first call.
+    """
+    try:
+        compiled = torch.compile(fn, dynamic=False, mode="reduce-overhead")
+    except Exception:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        nonlocal compiled
+        if compiled is not None:
+            try:
+                return compiled(*args, **kwargs)
+            except Exception:
+                compiled = None
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+
+# Reused RNG buffer for the jump-diffusion generator (re-allocated only when
+# the requested shape/device/dtype changes, i.e. never at steady state).
+_jump_diffusion_buf = None
+
+def _generate_jump_diffusion_parameter_seq(
     num_samples_expect: int,
     horizon: int,
     device: torch.device,
@@ -29,36 +127,91 @@ def generate_jump_diffusion_parameter_seq(
     """
     Multiplicative price factor (num_samples_expect, horizon). Strictly positive.
     In tick-space: delta_tick = log(factor) / log(1.0001).
+
+    The Gaussian mixture is drawn into one preallocated (N, H, 3) buffer:
+    channels 0/2 with a single .normal_() fill, channel 1 with .uniform_() for
+    the Bernoulli jump mask. One RNG launch instead of three, no ones/where
+    temporaries for the no-jump branch.
     """
+    global _jump_diffusion_buf
     sigma = 0.02
     mu = 0.0
-    z = torch.randn(num_samples_expect, horizon, device=device, dtype=dtype)
-    diffusion_factor = torch.exp(mu + sigma * z)
-
     jump_prob = 0.05
     jump_sigma = 0.10
-    jump_mask = (torch.rand(num_samples_expect, horizon, device=device, dtype=dtype) < jump_prob)
-    z_jump = torch.randn(num_samples_expect, horizon, device=device, dtype=dtype)
-    jump_factor = torch.ones(num_samples_expect, horizon, device=device, dtype=dtype)
-    jump_factor = torch.where(jump_mask, torch.exp(jump_sigma * z_jump), jump_factor)
 
-    params = diffusion_factor * jump_factor
-    params = torch.clamp(params, min=0.7, max=1.3)
-    return params
+    buf = _jump_diffusion_buf
+    if (
+        buf is None
+        or buf.shape != (num_samples_expect, horizon, 3)
+        or buf.device != device
+        or buf.dtype != dtype
+    ):
+        buf = torch.empty(num_samples_expect, horizon, 3, device=device, dtype=dtype)
+        _jump_diffusion_buf = buf
+
+    if device.type == "cpu" and dtype == torch.float32:
+        # NumPy fast path: fill the whole buffer with normals (out= is
+        # zero-copy into the torch storage), then overwrite the mask channel.
+        arr = buf.numpy()
+        _cpu_rng.standard_normal(out=arr, dtype=np.float32)
+        arr[..., 1] = _cpu_rng.random((num_samples_expect, horizon), dtype=np.float32)
+    else:
+        buf[..., 0::2].normal_()
+        buf[..., 1].uniform_()
 
-def uniswap_dynamics(state: torch.Tensor, action: torch.Tensor, params: torch.Tensor) -> torch.Tensor:
+    params = (mu + sigma * buf[..., 0]).exp_()
+    params *= torch.where(buf[..., 1] < jump_prob, (jump_sigma * buf[..., 2]).exp_(), 1.0)
+    return params.clamp_(min=0.7, max=1.3)
+
+@functools.lru_cache(maxsize=None)
+def _inv_log_base(device: torch.device, dtype: torch.dtype) -> torch.Tensor:
+    """
+    Cached 0-dim 1/log(1.0001): the dynamics multiplies by a resident tensor
+    instead of re-wrapping a Python float (and dividing) on every call.
     """
-    state: (..., 4) -> [t_market, t_pool, t_center, width_ticks]
+    return torch.tensor(1.0 / math.log(1.0001), device=device, dtype=dtype)
+
+
+def _track_pool(
+    t_pool: torch.Tensor,
+    next_t_market: torch.Tensor,
+    next_w_ticks: torch.Tensor,
+    lower: torch.Tensor,
+    upper: torch.Tensor,
+) -> torch.Tensor:
+    """
+    Pool tick tracking: follow the market tick with a deviation-dependent
+    gain, clamped to the position range. TorchScript fuses the abs/div/tanh/
+    mul/add/clamp chain into one pass instead of six full temporaries, which
+    also helps when torch.compile is unavailable.
+    """
+    drift = next_t_market - t_pool
+    rel_dev = torch.abs(drift) / torch.clamp(next_w_ticks, min=1e-6)
+    k = 0.2 + 0.75 * torch.tanh(2.0 * rel_dev)
+    return torch.clamp(t_pool + k * drift, lower, upper)
+
+try:
+    _track_pool = torch.jit.script(_track_pool)
+except Exception:
+    pass  # scripting is best-effort; eager computes the same values
+
+
+def _uniswap_dynamics(
+    state: Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor],
+    action: torch.Tensor,
+    params: torch.Tensor,
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    state: 4-tuple of (...,) channels [t_market, t_pool, t_center, width_ticks]
     action: (..., 2) -> [delta_t_center, delta_width_ticks]
     params: (...,) -> multiplicative price factor (strictly > 0)
+
+    State is SoA (one tensor per channel, see PoolStateSoA) so each channel is
+    read and written as a single contiguous stream with no final stack.
     """
-    t_market = state[..., 0]
-    t_pool = state[..., 1]
-    t_center = state[..., 2]
-    w_ticks = state[..., 3]
+    t_market, t_pool, t_center, w_ticks = state
 
-    log_base = math.log(1.0001)
-    delta_t_market = torch.log(params) / log_base
+    delta_t_market = torch.log(params).mul_(_inv_log_base(params.device, params.dtype))
     next_t_market = t_market + delta_t_market
 
     next_t_center = t_center + action[..., 0]
@@ -68,10 +221,12 @@ def uniswap_dynamics(state: torch.Tensor, action: torch.Tensor, params: torch.Te
     lower = next_t_center - (next_w_ticks / 2.0)
     upper = next_t_center + (next_w_ticks / 2.0)
 
-    rel_dev = torch.abs(next_t_market - t_pool) / torch.clamp(next_w_ticks, min=1e-6)
-    k = 0.2 + 0.75 * torch.tanh(2.0 * rel_dev)
+    next_t_pool = _track_pool(t_pool, next_t_market, next_w_ticks, lower, upper)
+
+    return next_t_market, next_t_pool, next_t_center, next_w_ticks
 
-    t_pool_raw = t_pool + k * (next_t_market - t_pool)
-    next_t_pool = torch.clamp(t_pool_raw, lower, upper)
 
-    return torch.stack([next_t_market, next_t_pool, next_t_center, next_w_ticks], dim=-1)
\ No newline at end of file
+# Compiled entry points: both are memory-bandwidth-bound elementwise chains
+# over (num_samples, num_samples_expect) tensors, the main MPPI hot path.
+generate_jump_diffusion_parameter_seq = _compile_kernel(_generate_jump_diffusion_parameter_seq)
+uniswap_dynamics = _compile_kernel(_uniswap_dynamics)
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""
+Simulation processes for local/testnet demos.
+
+Import simulators from here (``from dashboard.simulation import
+PriceSimulator``) rather than deep module paths, so there is exactly one
+canonical copy of each class and its module-level caches (selectors, RNG
+buffers, log queue) regardless of how callers spell the import.
+"""
+
+from .price_simulator import PriceSimulator
+from .swap_bot import SwapBot
+
+__all__ = ["PriceSimulator", "SwapBot"]
@@ -9,6 +9,8 @@ Environment Variables:
     BASE_SEPOLIA_RPC_URL / RPC_URL / ANVIL_RPC_URL: RPC endpoint
     PRIVATE_KEY: Private key for price updates (default: Anvil account 0)
     PRICE_SIMULATOR_INTERVAL: Update interval in seconds (default: 3)
+    PRICE_SIMULATOR_DEVIATION: Min relative move to publish on-chain (default: 0.005; 0 = every tick)
+    PRICE_SIMULATOR_HEARTBEAT: Max seconds between on-chain publishes (default: 60)
 
 Scenarios (ordered by intensity):
     demo        ±10% sine wave + small noise. Best for stable MPPI demos.
@@ -25,10 +27,17 @@ Volatility caps (max % move per step at 3 s interval):
     extreme     ≈ 2.5%
 """
 
+import logging
 import os
+import queue
+import threading
 import time
-import random
-import math
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 
 from web3 import Web3
 from dotenv import load_dotenv
@@ -39,11 +48,77 @@ from dashboard.config import CONTRACTS
 
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
+# 4-byte selectors hashed once at import; the calldata for both hot calls is
+# selector + (at most) one static word, assembled by hand in the methods.
+_UPDATE_SELECTOR = Web3.keccak(text="updateAnswer(int256)")[:4]
+_LATEST_ROUND_SELECTOR = Web3.keccak(text="latestRoundData()")[:4]
+
+
+def _setup_logging() -> None:
+    """Route this module's records through a bounded queue.
+
+    The tick loop only enqueues records; a background listener thread does
+    the formatting and terminal I/O. A slow or blocked stderr therefore
+    never stalls a tick, and if the queue fills up records are dropped
+    rather than backing up into the loop.
+    """
+    if log.handlers:
+        return
+    q = queue.Queue(maxsize=1000)
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    QueueListener(q, stream).start()
+    log.addHandler(QueueHandler(q))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
 
 class PriceSimulator:
+    # Per-scenario volatility ceilings, as multiples of base_vol:
+    #   demo/random_walk 1.0 (0.3%), volatile 4.0 (1.2%, was 10x = 5%),
+    #   crash/pump 2.5 (0.75%), extreme 8.0 (2.4%, was 2.5x × 10x = 12.5%).
+    # Resolved once per run_scenario call, not rebuilt as a dict per tick.
+    _VOL_CAP_MULT = {
+        "demo": 1.0,
+        "random_walk": 1.0,
+        "volatile": 4.0,
+        "crash": 2.5,
+        "pump": 2.5,
+        "extreme": 8.0,
+    }
+
+    # Integer scenario codes: the per-tick return generator branches on a
+    # small int instead of comparing strings. Unknown names fall back to
+    # random_walk, matching the old else-branch behaviour.
+    _DEMO, _VOLATILE, _EXTREME, _CRASH, _PUMP, _RANDOM_WALK = range(6)
+    _SCENARIO_CODES = {
+        "demo": _DEMO,
+        "volatile": _VOLATILE,
+        "extreme": _EXTREME,
+        "crash": _CRASH,
+        "pump": _PUMP,
+        "random_walk": _RANDOM_WALK,
+    }
+
     def __init__(self):
         self.rpc_url = get_rpc_url()
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        # Explicit session so every JSON-RPC request reuses one pooled TCP
+        # (and TLS) connection instead of paying per-request setup.
+        # max_retries=0: transport errors surface immediately into
+        # update_price's own retry loop instead of stacking urllib3 retries
+        # on top of it.
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        self.w3 = Web3(Web3.HTTPProvider(
+            self.rpc_url, session=session, request_kwargs={"timeout": 10},
+        ))
+        # Optional WebSocket endpoint: receipts are then confirmed per new
+        # block (push) instead of HTTP polling every 0.1 s.
+        self.ws_url = os.getenv("BASE_SEPOLIA_WS_URL") or os.getenv("WS_RPC_URL") or ""
 
         if not self.w3.is_connected():
             raise ConnectionError(f"Failed to connect to RPC at {self.rpc_url}")
@@ -91,76 +166,324 @@ class PriceSimulator:
         self.jump_size_mean = 0.0
         self.jump_size_std = 0.01      # ±1% jump std (was 2%)
 
+        # Per-run scenario constants; overwritten by _prepare_scenario.
+        self._scenario_code = self._RANDOM_WALK
+        self._vol_cap = self.base_vol * 4.0
+
+        # Demo sine wave from a 120-entry lookup table: one array read per
+        # tick, and — unlike the incremental rotation recurrence it
+        # replaces — immune to floating-point drift over long runs. The
+        # table holds the ±10% offsets directly, matching
+        # 0.10·sin(2π·step/120).
+        self._demo_targets = 0.10 * np.sin(2.0 * np.pi * np.arange(120) / 120.0)
+        self._demo_i = 0
+
+        # Noise is drawn in 4096-sample NumPy blocks and consumed one value
+        # per tick; random.gauss pays Python-level RNG + log/sqrt per call.
+        # The GARCH recursion itself stays scalar — each tick's volatility
+        # feeds back into the next, so returns cannot be pre-vectorized.
+        self._rng = np.random.default_rng()
+        self._normals = self._rng.standard_normal(4096)
+        self._normal_i = 0
+        self._uniforms = self._rng.random(4096)
+        self._uniform_i = 0
+
+        # Checksummed addresses resolved once — checksumming re-hashes the
+        # hex string on every conversion and neither address ever changes.
+        self._oracle_addr = self.oracle.address
+        self._sender_addr = self.account.address
+
+        # decimals never changes after deployment: precompute the scale once
+        # (int for encoding answers, float for decoding them).
+        self._scale = 10 ** self.decimals
+        self._price_scale = float(self._scale)
+        self._chain_id = self.w3.eth.chain_id
+        # Anvil auto-mines on submission, so mempool acceptance already
+        # implies inclusion and the receipt wait is pure latency.
+        self._instant_mining = self._chain_id == 31337
+
+        # Constant transaction fields, built once; per send only nonce,
+        # gas price and calldata differ, patched onto a shallow copy.
+        self._tx_template = {
+            "from": self._sender_addr,
+            "to": self._oracle_addr,
+            "gas": 300000,
+            "value": 0,
+            "chainId": self._chain_id,
+        }
+
+        # Local nonce cache: this account only ever sends from the simulator,
+        # so the nonce is tracked locally and the per-tick
+        # eth_getTransactionCount round-trip is skipped. Resynced lazily
+        # (None) after nonce/replacement errors. The lock keeps reads and
+        # advances atomic now that sends run on worker threads.
+        self._nonce = None
+        self._nonce_lock = threading.Lock()
+
+        # Last scaled answer actually sent: a tick that quantizes to the
+        # same int256 would re-publish the identical on-chain value, so it
+        # is skipped outright (gas + RPC saved) even when the deviation
+        # gate is disabled.
+        self._last_scaled_price = None
+
+        # Chainlink-style publish gating: an update goes on-chain only when
+        # the simulated price moved at least `deviation_threshold` since the
+        # last published value, or the heartbeat elapsed. Skipped ticks cost
+        # zero RPCs and zero gas; set the deviation to 0 to publish per tick.
+        self.deviation_threshold = float(os.getenv("PRICE_SIMULATOR_DEVIATION", "0.005"))
+        self.heartbeat = float(os.getenv("PRICE_SIMULATOR_HEARTBEAT", "60"))
+        self._last_published = None
+        self._last_publish_ts = 0.0
+
+        # EIP-1559 fee cache: the base fee moves at most ±12.5% per block,
+        # so a 30 s-old cap with 2x headroom plus the tip stays includable;
+        # invalidated on fee-related send errors. Type-2 txs only ever pay
+        # base fee + tip, so the headroom costs nothing when unused.
+        self._base_priority_fee = 10**9  # 1 gwei tip
+        self._priority_fee = self._base_priority_fee
+        # Replacement bump: geth-family nodes only replace a pending tx when
+        # both the tip and the cap rise >=10%. Compounded 1.15x per stuck
+        # round, reset once a publish confirms again.
+        self._fee_bump = 1.0
+        self._max_fee = None
+        self._fee_ts = 0.0
+        self._fee_ttl = 30.0
+
+        # Fire-and-forget confirmation: the send path queues the tx hash and
+        # a daemon thread confirms in the background, so a slow inclusion
+        # never blocks the next tick. Failures are logged and the fee/nonce
+        # caches invalidated so the next publish resyncs.
+        self._receipt_queue = queue.Queue()
+        self._receipt_thread = None
+
+    def _wait_for_receipt(self, tx_hash, timeout: float = 30):
+        """Wait for a receipt, block-driven over WebSocket when available.
+
+        With a WS endpoint the receipt is fetched once per newHeads event
+        instead of the ~300 HTTP polls a 30 s wait costs over HTTP. Falls
+        back to the standard polling wait when no WS URL is configured or
+        the subscription fails.
+        """
+        if self.ws_url:
+            try:
+                import asyncio
+                from web3 import AsyncWeb3, WebSocketProvider
+
+                async def _wait():
+                    async with AsyncWeb3(WebSocketProvider(self.ws_url)) as w3ws:
+                        await w3ws.eth.subscribe("newHeads")
+                        deadline = time.monotonic() + timeout
+                        while time.monotonic() < deadline:
+                            try:
+                                return await w3ws.eth.get_transaction_receipt(tx_hash)
+                            except Exception:
+                                pass
+                            remaining = deadline - time.monotonic()
+                            async for _ in w3ws.socket.process_subscriptions():
+                                break  # one new head -> re-check the receipt
+                            if remaining <= 0:
+                                break
+                        raise TimeoutError(f"Receipt not found within {timeout}s: {tx_hash.hex()}")
+
+                return asyncio.run(asyncio.wait_for(_wait(), timeout + 5))
+            except ImportError:
+                pass  # web3 < 7: no WebSocketProvider with subscriptions
+            except Exception:
+                pass  # WS hiccup: fall through to HTTP polling
+        # 50 ms poll latency: on fast chains the receipt lands within a
+        # couple of polls instead of waiting out web3's 100 ms+ default.
+        return self.w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=timeout, poll_latency=0.05
+        )
+
     def get_current_price(self) -> float:
-        _, answer, _, _, _ = self.oracle.functions.latestRoundData().call()
-        return float(answer) / (10**self.decimals)
+        # Raw eth_call with the cached selector: latestRoundData returns five
+        # static words and only the answer (word 1) is needed, so the
+        # contract-proxy ABI encode/decode per read is skipped.
+        raw = self.w3.eth.call({"to": self._oracle_addr, "data": _LATEST_ROUND_SELECTOR})
+        answer = int.from_bytes(raw[32:64], "big", signed=True)
+        return answer / self._price_scale
+
+    def _should_publish(self, price: float) -> bool:
+        if self._last_published is None:
+            return True
+        if abs(price / self._last_published - 1.0) >= self.deviation_threshold:
+            return True
+        return time.monotonic() - self._last_publish_ts >= self.heartbeat
+
+    def _watch_receipts(self) -> None:
+        while True:
+            tx_hash = self._receipt_queue.get()
+            try:
+                receipt = self._wait_for_receipt(tx_hash, timeout=30)
+                # A confirmation means the current fees clear; drop any
+                # replacement escalation back to the base tip.
+                self._restore_fees()
+                if receipt.status != 1:
+                    log.error("Price update reverted: %s", tx_hash.hex())
+                    # The chain kept the old answer; forget the optimistic
+                    # publish state or the skip-unchanged/deviation gates
+                    # would treat the stale on-chain value as current forever.
+                    self._last_scaled_price = None
+                    self._last_published = None
+            except Exception as e:
+                log.warning("Price update unconfirmed after 30 s: %s (%s)", tx_hash.hex(), e)
+                self._max_fee = None  # possibly underpriced: refetch the cap
+                with self._nonce_lock:
+                    self._nonce = None
+                self._last_scaled_price = None
+                self._last_published = None
+
+    def _check_backlog(self) -> None:
+        """Stop extending a chain of stuck pending transactions.
+
+        With fire-and-forget sends, unconfirmed txs show up as a growing
+        receipt queue. Past 10 outstanding hashes, resync the nonce to the
+        chain's latest included value and escalate fees past the node's
+        replacement rule, so the next publish replaces the stuck txs (same
+        nonce, bumped fee) instead of queueing ever further behind them.
+        """
+        if self._receipt_queue.qsize() <= 10:
+            return
+        with self._nonce_lock:
+            self._nonce = self.w3.eth.get_transaction_count(self._sender_addr)
+        self._bump_fees()
+        try:
+            while True:
+                self._receipt_queue.get_nowait()
+        except queue.Empty:
+            pass
+        # The drained txs may never land; don't let the publish gates assume
+        # their prices made it on-chain.
+        self._last_scaled_price = None
+        self._last_published = None
+        log.warning(
+            "Pending update backlog detected; resynced nonce, tip now %d wei",
+            self._priority_fee,
+        )
+
+    def _track_receipt(self, tx_hash) -> None:
+        if self._receipt_thread is None:
+            self._receipt_thread = threading.Thread(
+                target=self._watch_receipts, name="receipt-watcher", daemon=True
+            )
+            self._receipt_thread.start()
+        self._receipt_queue.put(tx_hash)
+
+    def _get_max_fee(self) -> int:
+        if self._instant_mining:
+            # Anvil's base fee starts at 1 gwei and only decays on an idle
+            # chain; a fixed 2 gwei cap always clears, with no block fetch.
+            return 2 * 10**9 + self._priority_fee
+        now = time.monotonic()
+        if self._max_fee is None or now - self._fee_ts > self._fee_ttl:
+            base_fee = self.w3.eth.get_block("latest")["baseFeePerGas"]
+            self._max_fee = int(2 * base_fee * self._fee_bump) + self._priority_fee
+            self._fee_ts = now
+        return self._max_fee
+
+    def _bump_fees(self) -> None:
+        """Escalate fees past the node's replacement rule (>=10% on both the
+        tip and the cap); compounds each call until a publish lands."""
+        self._priority_fee = int(self._priority_fee * 1.15) + 1
+        self._fee_bump *= 1.15
+        self._max_fee = None
+
+    def _restore_fees(self) -> None:
+        if self._fee_bump != 1.0:
+            self._priority_fee = self._base_priority_fee
+            self._fee_bump = 1.0
+            self._max_fee = None
+
+    def _sign_update(self, scaled_price: int, nonce: int, max_fee: int):
+        """Build and sign one updateAnswer transaction.
+
+        Kept separate from the send path so signing happens off the loop
+        thread: the run_scenario worker signs while the main thread sleeps
+        out the tick interval, keeping signing latency out of the period.
+        """
+        tx = self._tx_template.copy()
+        tx["nonce"] = nonce
+        tx["maxFeePerGas"] = max_fee
+        tx["maxPriorityFeePerGas"] = self._priority_fee
+        tx["data"] = _UPDATE_SELECTOR + scaled_price.to_bytes(32, "big", signed=True)
+        # LocalAccount.sign_transaction reuses the key object parsed at init
+        # instead of re-deriving it from the hex key on every send.
+        return self.account.sign_transaction(tx)
 
     def update_price(self, new_price: float) -> bool:
         """Update oracle price (with retry on nonce errors)."""
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                scaled_price = int(new_price * (10**self.decimals))
-                nonce = self.w3.eth.get_transaction_count(self.account.address, "pending")
-
-                balance = self.w3.eth.get_balance(self.account.address)
-                gas_price = self.w3.eth.gas_price
-                estimated_gas_cost = 300000 * gas_price
-
-                if balance < estimated_gas_cost:
-                    print(
-                        f"⚠️ Insufficient balance: {balance/1e18:.6f} ETH < "
-                        f"{estimated_gas_cost/1e18:.6f} ETH (gas cost)",
-                        flush=True,
-                    )
-                    return False
-
-                tx = self.oracle.functions.updateAnswer(scaled_price).build_transaction({
-                    "from": self.account.address,
-                    "nonce": nonce,
-                    "gas": 300000,
-                    "gasPrice": gas_price,
-                })
-                signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
+                scaled_price = int(new_price * self._scale)
+                if scaled_price == self._last_scaled_price:
+                    return True  # the on-chain answer already matches
+
+                self._check_backlog()
+                with self._nonce_lock:
+                    if self._nonce is None:
+                        self._nonce = self.w3.eth.get_transaction_count(self._sender_addr, "pending")
+                    nonce = self._nonce
+
+                # No pre-send balance check: the node rejects an unfundable
+                # tx anyway and the insufficient-funds handler below reports
+                # it, so the optimistic path carries zero extra reads.
+                max_fee = self._get_max_fee()
+                signed_tx = self._sign_update(scaled_price, nonce, max_fee)
                 tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=30)
-                return receipt.status == 1
+                with self._nonce_lock:
+                    # accepted to the mempool: nonce is consumed
+                    if self._nonce is not None:
+                        self._nonce = max(self._nonce, nonce + 1)
+                self._last_scaled_price = scaled_price
+                if not self._instant_mining:
+                    # Fire-and-forget: confirmation runs on the watcher
+                    # thread; the tick loop is free as soon as the node
+                    # accepts the tx.
+                    self._track_receipt(tx_hash)
+                return True
 
             except Exception as e:
                 error_str = str(e).lower()
 
                 if "insufficient funds" in error_str:
                     try:
-                        balance = self.w3.eth.get_balance(self.account.address)
+                        balance = self.w3.eth.get_balance(self._sender_addr)
                         balance_eth = balance / 1e18
                         gas_price = self.w3.eth.gas_price
                         estimated_cost = (300000 * gas_price) / 1e18
 
-                        print(
-                            f"⚠️ Insufficient funds. Balance: {balance_eth:.6f} ETH, "
-                            f"Estimated cost: {estimated_cost:.6f} ETH",
-                            flush=True,
+                        log.warning(
+                            "⚠️ Insufficient funds. Balance: %.6f ETH, "
+                            "Estimated cost: %.6f ETH",
+                            balance_eth, estimated_cost,
                         )
 
                         if balance_eth < 0.01:
-                            print(
-                                f"⚠️ CRITICAL: Low ETH balance ({balance_eth:.6f} ETH). "
+                            log.error(
+                                "⚠️ CRITICAL: Low ETH balance (%.6f ETH). "
                                 "Price updates paused.",
-                                flush=True,
+                                balance_eth,
                             )
                             time.sleep(10)
                             return False
                         elif estimated_cost > balance_eth:
                             return False
                     except Exception as balance_error:
-                        print(f"⚠️ Error checking balance: {balance_error}", flush=True)
+                        log.warning("⚠️ Error checking balance: %s", balance_error)
 
                 if "insufficient funds" not in error_str:
-                    import traceback
-                    print(f"DEBUG: Price update failed at attempt {attempt + 1}", flush=True)
-                    print(f"ERROR_LOG: {traceback.format_exc()}", flush=True)
+                    # %-style args + exc_info: the message and traceback are
+                    # only formatted if a handler actually emits the record.
+                    log.warning("Price update failed at attempt %d", attempt + 1, exc_info=True)
+
+                if "underpriced" in error_str or "fee" in error_str:
+                    self._bump_fees()  # stale or rejected fee: escalate on retry
 
                 if "nonce" in error_str or "replacement" in error_str:
+                    with self._nonce_lock:
+                        self._nonce = None  # resync from the node on the retry
                     time.sleep(0.5)
                     continue
 
@@ -170,10 +493,64 @@ class PriceSimulator:
 
         return False
 
-    def _generate_market_return(self, scenario: str, step: int, base_price: float, current_price: float) -> float:
+    def _next_normal(self) -> float:
+        if self._normal_i >= len(self._normals):
+            self._rng.standard_normal(out=self._normals)
+            self._normal_i = 0
+        v = self._normals[self._normal_i]
+        self._normal_i += 1
+        return float(v)
+
+    def _next_uniform(self) -> float:
+        if self._uniform_i >= len(self._uniforms):
+            self._rng.random(out=self._uniforms)
+            self._uniform_i = 0
+        v = self._uniforms[self._uniform_i]
+        self._uniform_i += 1
+        return float(v)
+
+    def submit_batch(self, prices: list) -> list:
+        """Sign and submit one update per price over consecutive nonces.
+
+        The whole nonce block is reserved up front under the lock, all
+        transactions are signed in parallel, and the raw sends go out in
+        nonce order so the node accepts the run without gaps. Useful for
+        backfilling a price path quickly (e.g. replaying history on Anvil).
+        Returns the tx hashes in submission order.
+        """
+        if not prices:
+            return []
+        with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = self.w3.eth.get_transaction_count(self._sender_addr, "pending")
+            start = self._nonce
+            self._nonce += len(prices)
+
+        max_fee = self._get_max_fee()
+        with ThreadPoolExecutor(max_workers=min(8, len(prices))) as pool:
+            signed = list(pool.map(
+                lambda iv: self._sign_update(int(iv[1] * self._scale), start + iv[0], max_fee),
+                enumerate(prices),
+            ))
+
+        hashes = []
+        for signed_tx in signed:
+            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            hashes.append(tx_hash)
+            if not self._instant_mining:
+                self._track_receipt(tx_hash)
+        return hashes
+
+    def _prepare_scenario(self, scenario: str) -> None:
+        """Resolve per-run scenario constants once, before the tick loop."""
+        self._scenario_code = self._SCENARIO_CODES.get(scenario, self._RANDOM_WALK)
+        self._vol_cap = self.base_vol * self._VOL_CAP_MULT.get(scenario, 4.0)
+
+    def _generate_market_return(self, base_price: float, current_price: float) -> float:
         """GARCH + Jump-Diffusion model for next-step return.
 
-        Volatility caps per scenario (% per 3-second step):
+        Scenario constants come from _prepare_scenario. Volatility caps per
+        scenario (% per 3-second step):
             demo        0.3%   extreme → 0.3%
             random_walk 0.3%
             volatile    0.3% → 1.2%  (MPPI max range ≈ 6%)
@@ -188,17 +565,8 @@ class PriceSimulator:
             + 0.05 * shock          # shock sensitivity halved (was 0.1)
         )
 
-        # Per-scenario volatility ceiling
-        vol_cap = {
-            "demo":        self.base_vol * 1.0,   # 0.3%  — never exceeds cap
-            "random_walk": self.base_vol * 1.0,   # 0.3%
-            "volatile":    self.base_vol * 4.0,   # 1.2%  (was 10x = 5%)
-            "crash":       self.base_vol * 2.5,   # 0.75%
-            "pump":        self.base_vol * 2.5,   # 0.75%
-            "extreme":     self.base_vol * 8.0,   # 2.4%  (was 2.5x × 10x = 12.5%)
-        }.get(scenario, self.base_vol * 4.0)
-
-        self.current_vol = max(self.base_vol * 0.5, min(vol_cap, self.current_vol))
+        # Per-scenario volatility ceiling (see _VOL_CAP_MULT)
+        self.current_vol = max(self.base_vol * 0.5, min(self._vol_cap, self.current_vol))
 
         # ── Gentle mean-reversion: pull toward base_price if drifted far ─────
         drift = current_price / base_price - 1.0
@@ -208,37 +576,39 @@ class PriceSimulator:
 
         change = 0.0
 
-        if scenario == "demo":
+        code = self._scenario_code
+        if code == self._DEMO:
             # Smooth sine wave ±10% + tiny noise — ideal for dashboard demos
-            target = base_price * (1 + 0.10 * math.sin(2 * math.pi * step / 120))
-            change = (target / current_price - 1) * 0.15 + random.gauss(0, self.base_vol * 0.5)
+            target = base_price * (1.0 + self._demo_targets[self._demo_i])
+            self._demo_i = (self._demo_i + 1) % 120
+            change = (target / current_price - 1) * 0.15 + self.base_vol * 0.5 * self._next_normal()
 
-        elif scenario == "volatile":
+        elif code == self._VOLATILE:
             # Moderate GARCH walk + small jumps (≤±2%)
-            change = random.gauss(0, self.current_vol)
-            if random.random() < 0.03:                       # 3% jump chance (was 5%)
-                jump = random.gauss(0, self.base_vol * 3)    # ±~0.9% std (was base*5)
+            change = self.current_vol * self._next_normal()
+            if self._next_uniform() < 0.03:                  # 3% jump chance (was 5%)
+                jump = self.base_vol * 3 * self._next_normal()   # ±~0.9% std (was base*5)
                 change += jump
                 if abs(jump) > 0.015:
-                    print(f"   >>> MARKET JUMP: {jump:+.2%}", flush=True)
+                    log.info("   >>> MARKET JUMP: %+.2f%%", jump * 100)
 
-        elif scenario == "extreme":
+        elif code == self._EXTREME:
             # Stress-test: large GARCH + frequent jumps
-            change = random.gauss(0, self.current_vol)
-            if random.random() < 0.10:                       # 10% jump chance (was 15%)
-                jump = random.gauss(0, self.base_vol * 6)    # ±~1.8% std (was base*5 × 2.5)
+            change = self.current_vol * self._next_normal()
+            if self._next_uniform() < 0.10:                  # 10% jump chance (was 15%)
+                jump = self.base_vol * 6 * self._next_normal()   # ±~1.8% std (was base*5 × 2.5)
                 change += jump
                 if abs(jump) > 0.02:
-                    print(f"   >>> MARKET JUMP: {jump:+.2%}", flush=True)
+                    log.info("   >>> MARKET JUMP: %+.2f%%", jump * 100)
 
-        elif scenario == "crash":
-            change = -0.003 + random.gauss(0, self.current_vol)
+        elif code == self._CRASH:
+            change = -0.003 + self.current_vol * self._next_normal()
 
-        elif scenario == "pump":
-            change = +0.003 + random.gauss(0, self.current_vol)
+        elif code == self._PUMP:
+            change = +0.003 + self.current_vol * self._next_normal()
 
         else:  # random_walk
-            change = random.gauss(0, self.base_vol)
+            change = self.base_vol * self._next_normal()
 
         # Apply mean-reversion + momentum
         change = change + reversion + (self.last_return * self.momentum)
@@ -250,40 +620,104 @@ class PriceSimulator:
 
         Scenarios: demo, volatile, crash, pump, random_walk, extreme
         """
+        _setup_logging()
+        self._prepare_scenario(scenario)
         print(f"Price Simulator: Started | Scenario: {scenario} | Interval: {interval}s", flush=True)
         current_price = base_price
         step = 0
 
+        # The RPC pipeline (sign + send + receipt wait) runs on a worker
+        # thread so it overlaps the sleep interval instead of adding to it;
+        # the effective tick period stays `interval` even when confirmation
+        # takes a comparable amount of time. One worker keeps sends ordered.
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        # Absolute-deadline scheduling: each tick targets start + n·interval
+        # on the monotonic clock, so per-tick work no longer accumulates as
+        # drift the way sleep(interval)-after-work does.
+        next_deadline = time.monotonic() + interval
+
         while True:
             try:
-                ret = self._generate_market_return(scenario, step, base_price, current_price)
+                ret = self._generate_market_return(base_price, current_price)
                 current_price *= 1 + ret
                 # Hard floor at 50% of base (was 10%, prevents extreme crashes)
                 current_price = max(current_price, base_price * 0.5)
 
-                success = self.update_price(current_price)
+                publish = self._should_publish(current_price)
+                if publish:
+                    future = executor.submit(self.update_price, current_price)
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                    next_deadline += interval
+                else:
+                    # Fell behind (slow RPC stretch): realign rather than
+                    # burst through the missed deadlines.
+                    next_deadline = time.monotonic() + interval
+                success = future.result() if publish else True
+                if publish and success:
+                    self._last_published = current_price
+                    self._last_publish_ts = time.monotonic()
 
                 if not success:
-                    print(f"[{step:04d}] ❌ Failed to update price: ${current_price:,.2f}", flush=True)
+                    log.error("[%04d] ❌ Failed to update price: $%.2f", step, current_price)
                 else:
                     diff = ((current_price / base_price) - 1) * 100
                     if abs(diff) > 2.0 or step % 20 == 0:
-                        print(
-                            f"[{step:04d}] Price: ${current_price:,.2f} ({diff:+.2f}%) | "
-                            f"σ: {self.current_vol:.2%}",
-                            flush=True,
+                        log.info(
+                            "[%04d] Price: $%.2f (%+.2f%%) | σ: %.2f%%",
+                            step, current_price, diff, self.current_vol * 100,
                         )
 
                 step += 1
-                time.sleep(interval)
             except KeyboardInterrupt:
                 print("\nSimulator stopped.")
+                executor.shutdown(wait=False)
                 break
             except Exception as e:
-                print(f"Loop error: {e}", flush=True)
+                log.error("Loop error: %s", e)
                 time.sleep(interval)
 
 
+    def run_block_driven(self, scenario: str = "volatile", base_price: float = 2500.0):
+        """Publish one update per new chain block instead of per wall-clock tick.
+
+        Subscribes to newHeads over WebSocket, so the loop wakes exactly when
+        a block lands (no polling, no fixed-interval drift) and the next
+        price hits the mempool at the start of the following block. Requires
+        BASE_SEPOLIA_WS_URL / WS_RPC_URL; not useful on Anvil's default
+        mine-on-demand mode, where blocks only appear when txs are sent.
+        """
+        if not self.ws_url:
+            raise ValueError("run_block_driven requires BASE_SEPOLIA_WS_URL / WS_RPC_URL")
+        _setup_logging()
+        self._prepare_scenario(scenario)
+        import asyncio
+        from web3 import AsyncWeb3, WebSocketProvider
+
+        async def _run():
+            print(f"Price Simulator: Started | Scenario: {scenario} | Block-driven", flush=True)
+            current_price = base_price
+            step = 0
+            async with AsyncWeb3(WebSocketProvider(self.ws_url)) as w3ws:
+                await w3ws.eth.subscribe("newHeads")
+                async for _ in w3ws.socket.process_subscriptions():
+                    ret = self._generate_market_return(base_price, current_price)
+                    current_price = max(current_price * (1 + ret), base_price * 0.5)
+                    if not self.update_price(current_price):
+                        log.error("[%04d] ❌ Failed to update price: $%.2f", step, current_price)
+                    elif step % 20 == 0:
+                        diff = ((current_price / base_price) - 1) * 100
+                        log.info("[%04d] Price: $%.2f (%+.2f%%)", step, current_price, diff)
+                    step += 1
+
+        try:
+            asyncio.run(_run())
+        except KeyboardInterrupt:
+            print("\nSimulator stopped.")
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -296,11 +730,19 @@ if __name__ == "__main__":
     )
     parser.add_argument("--base-price", type=float, default=2500.0)
     parser.add_argument("--interval", type=float, default=3.0)
+    parser.add_argument(
+        "--block-driven",
+        action="store_true",
+        help="Tick on newHeads events instead of a fixed interval (needs a WS RPC URL)",
+    )
     args = parser.parse_args()
 
     simulator = PriceSimulator()
-    simulator.run_scenario(
-        scenario=args.scenario,
-        base_price=args.base_price,
-        interval=args.interval,
-    )
+    if args.block_driven:
+        simulator.run_block_driven(scenario=args.scenario, base_price=args.base_price)
+    else:
+        simulator.run_scenario(
+            scenario=args.scenario,
+            base_price=args.base_price,
+            interval=args.interval,
+        )
@@ -4,27 +4,102 @@ Not used on mainnet.
 """
 
 import os
+import json
+import logging
 import time
-import random
+import queue
 import sqlite3
 import threading
+from logging.handlers import QueueHandler, QueueListener
 
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 from web3 import Web3
 from dotenv import load_dotenv
 
 from dashboard.chain.client import get_rpc_url
-from dashboard.chain.abis import ERC20_ABI, PERMIT2_ABI, POOL_MANAGER_ABI, SWAP_ROUTER_ABI
-from dashboard.chain.pool import compute_pool_id, fetch_slot0, fetch_liquidity
+from dashboard.chain.abis import (
+    ERC20_ABI,
+    MULTICALL3_ABI,
+    MULTICALL3_ADDRESS,
+    PERMIT2_ABI,
+    POOL_MANAGER_ABI,
+    SWAP_ROUTER_ABI,
+)
+from dashboard.chain.pool import (
+    compute_pool_id,
+    decode_liquidity_word,
+    decode_slot0_word,
+    fetch_liquidity,
+    fetch_slot0,
+    liquidity_storage_slot,
+    slot0_storage_slot,
+)
 from dashboard.data_store import store
 from dashboard.config import CONTRACTS
 
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
+
+def _setup_logging() -> None:
+    """Emit this module's records through a bounded queue so terminal I/O
+    happens on a listener thread, never inside a trading loop. Records are
+    dropped if the queue fills instead of stalling the sender."""
+    if log.handlers:
+        return
+    q = queue.Queue(maxsize=1000)
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter("%(message)s"))
+    QueueListener(q, stream).start()
+    log.addHandler(QueueHandler(q))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+# Wei-denominated sizing constants, kept as ints so the sizing math never
+# round-trips through float 1e18 conversions on the hot path.
+_ONE_E18 = 10**18
+_MIN_AMOUNT = 10**16        # 0.01 tokens: smallest arb trade worth sending
+_BASE_AMOUNT = _ONE_E18
+_MAX_AMOUNT = 5 * _ONE_E18
+
+# Hand-built calldata selectors for the reads routed through Multicall3.
+_EXTSLOAD_SELECTOR = Web3.keccak(text="extsload(bytes32)")[:4]
+_BALANCE_OF_SELECTOR = Web3.keccak(text="balanceOf(address)")[:4]
+
+# Kept as a single constant so the connection's statement cache reuses one
+# prepared plan across polls instead of recompiling the SQL text.
+_LATEST_PRICE_ROW_SQL = (
+    "SELECT timestamp, pool_price, external_price, pool_liquidity, price_lower, price_upper "
+    "FROM price_history ORDER BY timestamp DESC LIMIT 1"
+)
+
+# Same column order as DataStore.append_tx_event; rows queued by the trading
+# threads are flushed in batches by the event writer.
+_TX_EVENT_INSERT_SQL = (
+    "INSERT INTO tx_events "
+    "(timestamp, actor, event_type, tx_hash, gas_used, gas_price_wei, cost_eth, "
+    "pool_price, portfolio_value_token1, portfolio_pnl_token1, meta_json) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
 
 class SwapBot:
     def __init__(self):
+        _setup_logging()
         self.rpc_url = get_rpc_url()
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        # Explicit keep-alive session shared by all bot threads so JSON-RPC
+        # calls reuse pooled TCP connections instead of renegotiating.
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        self.w3 = Web3(Web3.HTTPProvider(
+            self.rpc_url, session=session, request_kwargs={"timeout": 10},
+        ))
 
         # Use a dedicated key for arbitrage to allow "infinite balance" minting locally
         # without accidentally affecting MPPI position sizing.
@@ -38,6 +113,25 @@ class SwapBot:
         self._initial_portfolio_value_token1 = None
         self._last_portfolio_value_token1 = None
 
+        # Arb hysteresis state: direction/ratio/time of the last executed
+        # arb trade, used to suppress same-direction churn on deviations
+        # that barely moved since the previous swap.
+        self._last_arb_direction = None
+        self._last_arb_ratio = None
+        self._last_arb_ts = 0.0
+
+        # Local nonce allocator shared by both trader threads: one
+        # eth_getTransactionCount at first use, then handed out locally.
+        # _reset_nonce() forces a resync after nonce-related send errors.
+        self._nonce = None
+        self._nonce_lock = threading.Lock()
+
+        # eth_gasPrice barely moves between swaps on the chains this bot
+        # targets; cache it for a few seconds instead of refetching per tx.
+        self._gas_price_cache = None
+        self._gas_price_ts = 0.0
+        self._gas_price_ttl = 5.0
+
         self.pool_manager_address = Web3.to_checksum_address(CONTRACTS["pool_manager"])
         self.permit2_address = Web3.to_checksum_address(
             CONTRACTS.get("permit2", "0x000000000022D473030F116dDEE9F6B43aC78BA3")
@@ -53,6 +147,76 @@ class SwapBot:
         self.pool_manager = self.w3.eth.contract(address=self.pool_manager_address, abi=POOL_MANAGER_ABI)
         self.router = self.w3.eth.contract(address=self.swap_router_address, abi=SWAP_ROUTER_ABI)
         self.permit2 = self.w3.eth.contract(address=self.permit2_address, abi=PERMIT2_ABI)
+        # Multicall3 only exists where it was actually deployed — a plain
+        # local Anvil chain has no code at the canonical address — so probe
+        # once here rather than paying a doomed aggregate3 call per swap.
+        multicall_address = Web3.to_checksum_address(MULTICALL3_ADDRESS)
+        try:
+            has_multicall = len(self.w3.eth.get_code(multicall_address)) > 0
+        except Exception:
+            has_multicall = False
+        self.multicall = (
+            self.w3.eth.contract(address=multicall_address, abi=MULTICALL3_ABI)
+            if has_multicall
+            else None
+        )
+
+        # Contract wrappers and the pool key are immutable; building them per
+        # call re-parses the ABI every time, so construct them once here.
+        self._erc20 = {
+            addr: self.w3.eth.contract(address=addr, abi=ERC20_ABI)
+            for addr in (self.token0_address, self.token1_address)
+        }
+        self.pool_key = (
+            self.token0_address,
+            self.token1_address,
+            self.fee,
+            self.tick_spacing,
+            self.hook_address,
+        )
+
+        # Raw calldata for the hot balance reads (selector + padded owner):
+        # eth_call with fixed bytes skips web3's per-call ABI encode/decode.
+        self._owner_word = bytes(12) + bytes.fromhex(self.account.address[2:])
+        self._bal_calldata = {
+            addr: _BALANCE_OF_SELECTOR + self._owner_word
+            for addr in (self.token0_address, self.token1_address)
+        }
+
+        # The pool id (keccak over the encoded pool key) is invariant for the
+        # bot's lifetime, and so is the whole post-swap Multicall3 call list.
+        self._pool_id = compute_pool_id(
+            self.token0_address, self.token1_address,
+            self.fee, self.tick_spacing, self.hook_address,
+        )
+        self._post_swap_calls = [
+            (self.pool_manager_address, True, _EXTSLOAD_SELECTOR + slot0_storage_slot(self._pool_id)),
+            (self.pool_manager_address, True, _EXTSLOAD_SELECTOR + liquidity_storage_slot(self._pool_id)),
+            (self.token0_address, True, self._bal_calldata[self.token0_address]),
+            (self.token1_address, True, self._bal_calldata[self.token1_address]),
+        ]
+
+        # Noise-trader decisions drawn in blocks: NumPy's PCG fills whole
+        # buffers at once instead of per-iteration random.* state updates.
+        self._rng = np.random.default_rng()
+        self._noise_sleeps = self._rng.uniform(5.0, 15.0, size=1024)
+        self._noise_amounts = self._rng.uniform(0.1, 1.0, size=1024)
+        self._noise_dirs = self._rng.integers(0, 2, size=1024, dtype=np.uint8)
+        self._noise_i = len(self._noise_sleeps)
+
+        # (token, spender) pairs with a confirmed max allowance; lets
+        # execute_swap skip the per-swap allowance read once setup succeeded.
+        self._approved = set()
+
+        # Swaps the noise trader fires without waiting; a daemon reaper
+        # drains the queue and runs the receipt/PnL bookkeeping off-thread.
+        self._pending_swaps = queue.Queue()
+        threading.Thread(target=self._swap_reaper, daemon=True, name="swap-reaper").start()
+
+        # tx_events rows are queued here and flushed in batches by a daemon
+        # writer, keeping SQLite commit latency out of the trading threads.
+        self._event_q = queue.Queue()
+        threading.Thread(target=self._event_writer, daemon=True, name="event-writer").start()
 
         self.approve_tokens()
         self.ensure_infinite_balance()
@@ -62,11 +226,73 @@ class SwapBot:
     # ------------------------------------------------------------------
 
     def get_pool_id(self) -> bytes:
-        return compute_pool_id(
-            self.token0_address, self.token1_address,
-            self.fee, self.tick_spacing, self.hook_address,
+        return self._pool_id
+
+    def _read_post_swap_state(self):
+        """Fetch slot0, liquidity and both token balances after a swap.
+
+        All four reads are fused into a single Multicall3 aggregate3 eth_call
+        (one round-trip, one EVM invocation) when the aggregator exists on
+        the connected chain; otherwise individual calls are issued directly.
+
+        Returns (slot0_dict_or_None, liquidity, bal0, bal1).
+        """
+        if self.multicall is not None:
+            try:
+                results = self.multicall.functions.aggregate3(self._post_swap_calls).call()
+                if all(success for success, _ in results):
+                    return (
+                        decode_slot0_word(results[0][1]),
+                        decode_liquidity_word(results[1][1]),
+                        int.from_bytes(results[2][1][-32:], "big"),
+                        int.from_bytes(results[3][1][-32:], "big"),
+                    )
+            except Exception:
+                pass
+
+        slot0_data = fetch_slot0(self.pool_manager, self._pool_id)
+        liquidity = fetch_liquidity(self.pool_manager, self._pool_id) or 0
+        try:
+            bal0 = self._balance_of(self.token0_address)
+            bal1 = self._balance_of(self.token1_address)
+        except Exception:
+            bal0 = bal1 = None
+        return slot0_data, liquidity, bal0, bal1
+
+    def _balance_of(self, token_addr: str) -> int:
+        raw = self.w3.eth.call({"to": token_addr, "data": self._bal_calldata[token_addr]})
+        return int.from_bytes(raw[-32:], "big")
+
+    # ------------------------------------------------------------------
+    # Nonce management
+    # ------------------------------------------------------------------
+
+    def _next_nonce(self) -> int:
+        with self._nonce_lock:
+            if self._nonce is None:
+                self._nonce = self.w3.eth.get_transaction_count(self.account.address)
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    def _reset_nonce(self):
+        with self._nonce_lock:
+            self._nonce = None
+
+    def _wait_receipt(self, tx_hash, timeout: int = 30):
+        """Receipt wait tuned for fast chains: 50 ms polling instead of the
+        library default (~2 s), which dwarfs Anvil's confirmation time."""
+        return self.w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=timeout, poll_latency=0.05
         )
 
+    def _get_gas_price(self) -> int:
+        now = time.monotonic()
+        if self._gas_price_cache is None or now - self._gas_price_ts > self._gas_price_ttl:
+            self._gas_price_cache = self.w3.eth.gas_price
+            self._gas_price_ts = now
+        return self._gas_price_cache
+
     # ------------------------------------------------------------------
     # Token approvals
     # ------------------------------------------------------------------
@@ -82,45 +308,50 @@ class SwapBot:
             ("Permit2", self.permit2_address),
         ]
 
-        for token_addr in [self.token0_address, self.token1_address]:
-            token = self.w3.eth.contract(address=token_addr, abi=ERC20_ABI)
-
+        for token_addr, token in self._erc20.items():
             for _, spender_addr in spenders:
                 try:
                     current_allowance = token.functions.allowance(self.account.address, spender_addr).call()
                     if current_allowance < max_uint256 // 2:
                         tx = token.functions.approve(spender_addr, max_uint256).build_transaction({
                             "from": self.account.address,
-                            "nonce": self.w3.eth.get_transaction_count(self.account.address),
+                            "nonce": self._next_nonce(),
                             "gas": 200000,
-                            "gasPrice": self.w3.eth.gas_price,
+                            "gasPrice": self._get_gas_price(),
                         })
                         signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
                         tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                        self.w3.eth.wait_for_transaction_receipt(tx_hash)
+                        self._wait_receipt(tx_hash)
+                    self._approved.add((token_addr, spender_addr))
                 except Exception as e:
-                    print(f"Token approval error: {e}", flush=True)
+                    self._reset_nonce()
+                    log.warning("Token approval error: %s", e)
 
             try:
                 p2_allowance = self.permit2.functions.allowance(
                     self.account.address, token_addr, self.swap_router_address
                 ).call()
-                if p2_allowance[0] < max_uint160 // 2:
+                if p2_allowance[0] >= max_uint160 // 2:
+                    self._approved.add(("permit2", token_addr))
+                else:
                     tx = self.permit2.functions.approve(
                         token_addr, self.swap_router_address, max_uint160, max_uint48
                     ).build_transaction({
                         "from": self.account.address,
-                        "nonce": self.w3.eth.get_transaction_count(self.account.address),
+                        "nonce": self._next_nonce(),
                         "gas": 200000,
-                        "gasPrice": self.w3.eth.gas_price,
+                        "gasPrice": self._get_gas_price(),
                     })
                     signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
                     tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                    receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+                    receipt = self._wait_receipt(tx_hash)
                     if receipt["status"] != 1:
-                        print(f"❌ Permit2 Approval failed for {token_addr}", flush=True)
+                        log.error("❌ Permit2 Approval failed for %s", token_addr)
+                    else:
+                        self._approved.add(("permit2", token_addr))
             except Exception as e:
-                print(f"Permit2 approval error: {e}", flush=True)
+                self._reset_nonce()
+                log.warning("Permit2 approval error: %s", e)
 
     def ensure_infinite_balance(self):
         """Local Anvil helper: keep arb bot balances topped up via token.mint().
@@ -133,10 +364,27 @@ class SwapBot:
         target = int(1_000_000_000 * 1e18)
         refill_threshold = int(target * 0.2)
 
-        for token_addr in [self.token0_address, self.token1_address]:
+        tokens = list(self._erc20.items())
+
+        # Both balance reads in one batch POST where supported, using the
+        # precomputed calldata instead of the ABI encoder.
+        try:
+            if hasattr(self.w3, "batch_requests"):
+                with self.w3.batch_requests() as batch:
+                    for addr, _ in tokens:
+                        batch.add(self.w3.eth.call({"to": addr, "data": self._bal_calldata[addr]}))
+                    balances = [int.from_bytes(raw[-32:], "big") for raw in batch.execute()]
+            else:
+                balances = [self._balance_of(addr) for addr, _ in tokens]
+        except Exception as e:
+            log.warning("⚠️ Could not read bot balances (skipping refill): %s", e)
+            return
+
+        # Send every needed mint back-to-back on consecutive nonces, then
+        # wait once: when the last mint is mined the earlier ones are too.
+        sent = []
+        for (token_addr, token), bal in zip(tokens, balances):
             try:
-                token = self.w3.eth.contract(address=token_addr, abi=ERC20_ABI)
-                bal = token.functions.balanceOf(self.account.address).call()
                 if bal >= refill_threshold:
                     continue
                 amount_to_mint = target - bal
@@ -144,70 +392,88 @@ class SwapBot:
                     continue
                 tx = token.functions.mint(self.account.address, int(amount_to_mint)).build_transaction({
                     "from": self.account.address,
-                    "nonce": self.w3.eth.get_transaction_count(self.account.address),
+                    "nonce": self._next_nonce(),
                     "gas": 300_000,
-                    "gasPrice": self.w3.eth.gas_price,
+                    "gasPrice": self._get_gas_price(),
                 })
                 signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
                 tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-                receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-                if receipt["status"] != 1:
-                    print(f"❌ Mint failed for {token_addr}", flush=True)
-                else:
-                    print(f"🪙 Minted to arb bot: {token_addr} (+{amount_to_mint/1e18:.0f})", flush=True)
+                sent.append((token_addr, amount_to_mint, tx_hash))
             except Exception as e:
-                print(
-                    f"⚠️ Could not mint {token_addr} (arb infinite balance disabled for this token): {e}",
-                    flush=True,
+                self._reset_nonce()
+                log.warning(
+                    "⚠️ Could not mint %s (arb infinite balance disabled for this token): %s",
+                    token_addr, e,
                 )
 
+        if not sent:
+            return
+
+        try:
+            self._wait_receipt(sent[-1][2])
+            for token_addr, amount_to_mint, tx_hash in sent:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+                if receipt["status"] != 1:
+                    log.error("❌ Mint failed for %s", token_addr)
+                else:
+                    log.info("🪙 Minted to arb bot: %s (+%.0f)", token_addr, amount_to_mint / 1e18)
+        except Exception as e:
+            self._reset_nonce()
+            log.warning("⚠️ Mint confirmation error: %s", e)
+
     # ------------------------------------------------------------------
     # Swap execution
     # ------------------------------------------------------------------
 
     def execute_swap(self, zero_for_one: bool, amount_in: int) -> bool:
-        """Execute a swap via SwapRouter."""
+        """Execute a swap via SwapRouter and wait for its outcome."""
+        sent = self._send_swap(zero_for_one, amount_in)
+        if sent is None:
+            return False
+        return self._finalize_swap(*sent)
+
+    def _send_swap(self, zero_for_one: bool, amount_in: int):
+        """Validate, sign and send a swap, returning as soon as the node
+        accepts it. Returns the args for _finalize_swap, or None if nothing
+        was sent."""
         try:
             token_in = self.token0_address if zero_for_one else self.token1_address
-            token_contract = self.w3.eth.contract(address=token_in, abi=ERC20_ABI)
+            token_contract = self._erc20[token_in]
             self.ensure_infinite_balance()
 
-            balance = token_contract.functions.balanceOf(self.account.address).call()
+            balance = self._balance_of(token_in)
+
             if balance < amount_in:
                 clamped = int(balance * 0.95)
                 if clamped <= 0:
-                    print(f"Insufficient balance for swap. Has {balance}, needs {amount_in}", flush=True)
-                    return False
+                    log.warning("Insufficient balance for swap. Has %d, needs %d", balance, amount_in)
+                    return None
                 amount_in = clamped
-                if amount_in < int(0.001 * 1e18):
-                    print(f"Insufficient balance for swap (too small after clamp). Has {balance}", flush=True)
-                    return False
-
-            max_uint256 = 2**256 - 1
-            router_allowance = token_contract.functions.allowance(
-                self.account.address, self.swap_router_address
-            ).call()
-            if router_allowance < max_uint256 // 2:
-                tx = token_contract.functions.approve(self.swap_router_address, max_uint256).build_transaction({
-                    "from": self.account.address,
-                    "nonce": self.w3.eth.get_transaction_count(self.account.address),
-                    "gas": 200000,
-                    "gasPrice": self.w3.eth.gas_price,
-                })
-                signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-                self.w3.eth.wait_for_transaction_receipt(
-                    self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-                )
-
-            pool_key = (
-                self.token0_address,
-                self.token1_address,
-                self.fee,
-                self.tick_spacing,
-                self.hook_address,
-            )
+                if amount_in < _ONE_E18 // 1000:
+                    log.warning("Insufficient balance for swap (too small after clamp). Has %d", balance)
+                    return None
+
+            # approve_tokens at init already set a max allowance; only pairs
+            # that failed there are re-checked (and approved) on the hot path.
+            if (token_in, self.swap_router_address) not in self._approved:
+                max_uint256 = 2**256 - 1
+                router_allowance = token_contract.functions.allowance(
+                    self.account.address, self.swap_router_address
+                ).call()
+                if router_allowance < max_uint256 // 2:
+                    tx = token_contract.functions.approve(self.swap_router_address, max_uint256).build_transaction({
+                        "from": self.account.address,
+                        "nonce": self._next_nonce(),
+                        "gas": 200000,
+                        "gasPrice": self._get_gas_price(),
+                    })
+                    signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
+                    self._wait_receipt(
+                        self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+                    )
+                self._approved.add((token_in, self.swap_router_address))
 
-            nonce = self.w3.eth.get_transaction_count(self.account.address)
+            pool_key = self.pool_key
             amount_in_uint256 = int(amount_in) if amount_in <= 2**255 - 1 else amount_in
 
             tx = self.router.functions.swapExactTokensForTokens(
@@ -215,112 +481,174 @@ class SwapBot:
                 self.account.address, int(time.time()) + 600,
             ).build_transaction({
                 "from": self.account.address,
-                "nonce": nonce,
+                "nonce": self._next_nonce(),
                 "gas": 1000000,
-                "gasPrice": self.w3.eth.gas_price,
+                "gasPrice": self._get_gas_price(),
             })
 
             signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
             tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            return tx_hash, zero_for_one, amount_in
+
+        except Exception as e:
+            # The nonce may already be consumed by the time build/sign/send
+            # fails (for any reason, not just nonce errors); resync so the
+            # allocator never leaves a gap the node would queue behind.
+            self._reset_nonce()
+            log.warning("Swap failed: %s: %s", type(e).__name__, e, exc_info=True)
+            return None
+
+    def _finalize_swap(self, tx_hash, zero_for_one: bool, amount_in: int) -> bool:
+        """Receipt wait, post-swap bookkeeping and PnL logging for a sent swap."""
+        try:
+            receipt = self._wait_receipt(tx_hash)
 
             if receipt["status"] == 1:
                 try:
-                    pool_id = self.get_pool_id()
-                    slot0_data = fetch_slot0(self.pool_manager, pool_id)
+                    slot0_data, liquidity_after, bal0, bal1 = self._read_post_swap_state()
                     if slot0_data:
                         price_after = slot0_data["price"]
                         tick_after = slot0_data["tick"]
                         sqrt_price_x96 = slot0_data["sqrtPriceX96"]
 
                         try:
-                            bal0 = self.w3.eth.contract(address=self.token0_address, abi=ERC20_ABI).functions.balanceOf(self.account.address).call()
-                            bal1 = self.w3.eth.contract(address=self.token1_address, abi=ERC20_ABI).functions.balanceOf(self.account.address).call()
                             v_token1 = (bal1 / 1e18) + (bal0 / 1e18) * float(price_after)
                             if self._initial_portfolio_value_token1 is None:
                                 self._initial_portfolio_value_token1 = v_token1
                             self._last_portfolio_value_token1 = v_token1
                             pnl_token1 = v_token1 - self._initial_portfolio_value_token1
-                            print(
-                                f"📊 Arb PnL: value={v_token1:.4f} token1, PnL={pnl_token1:+.4f} token1",
-                                flush=True,
+                            log.info(
+                                "📊 Arb PnL: value=%.4f token1, PnL=%+.4f token1",
+                                v_token1, pnl_token1,
                             )
                         except Exception:
                             v_token1 = None
                             pnl_token1 = None
 
-                        liquidity_after = fetch_liquidity(self.pool_manager, pool_id) or 0
-
-                        print(
-                            f"✅ Swap: {'0->1' if zero_for_one else '1->0'} | "
-                            f"{amount_in/1e18:.2f} tokens | Price: {price_after:.4f} | "
-                            f"Tick: {tick_after} | Liquidity: {liquidity_after/1e18:.2f} | "
-                            f"{tx_hash.hex()[:10]}...",
-                            flush=True,
+                        log.info(
+                            "✅ Swap: %s | %.2f tokens | Price: %.4f | Tick: %s | Liquidity: %.2f | %s...",
+                            "0->1" if zero_for_one else "1->0",
+                            amount_in / 1e18, price_after, tick_after,
+                            liquidity_after / 1e18, tx_hash.hex()[:10],
                         )
 
                         try:
                             gas_used = int(receipt.get("gasUsed", 0))
-                            gas_price = int(receipt.get("effectiveGasPrice", self.w3.eth.gas_price))
+                            gas_price = int(receipt.get("effectiveGasPrice", self._get_gas_price()))
                             cost_eth = (gas_used * gas_price) / 1e18
-                            store.append_tx_event(
-                                timestamp=time.time(),
-                                actor="arb",
-                                event_type="swap",
-                                tx_hash=tx_hash.hex(),
-                                gas_used=gas_used,
-                                gas_price_wei=gas_price,
-                                cost_eth=cost_eth,
-                                pool_price=float(price_after),
-                                portfolio_value_token1=v_token1,
-                                portfolio_pnl_token1=pnl_token1,
-                                meta={
+                            meta_json = json.dumps(
+                                {
                                     "direction": "0->1" if zero_for_one else "1->0",
                                     "amount_in_e18": int(amount_in),
                                     "tick_after": int(tick_after),
                                 },
+                                ensure_ascii=False,
                             )
+                            self._event_q.put((
+                                time.time(),
+                                "arb",
+                                "swap",
+                                tx_hash.hex(),
+                                gas_used,
+                                gas_price,
+                                cost_eth,
+                                float(price_after),
+                                v_token1,
+                                pnl_token1,
+                                meta_json,
+                            ))
                         except Exception:
                             pass
                     else:
-                        print(
-                            f"✅ Swap: {'0->1' if zero_for_one else '1->0'} | "
-                            f"{amount_in/1e18:.2f} tokens | {tx_hash.hex()[:10]}... "
-                            "(Error fetching post-swap state)",
-                            flush=True,
+                        log.info(
+                            "✅ Swap: %s | %.2f tokens | %s... (Error fetching post-swap state)",
+                            "0->1" if zero_for_one else "1->0",
+                            amount_in / 1e18, tx_hash.hex()[:10],
                         )
                 except Exception as e:
-                    print(
-                        f"✅ Swap: {'0->1' if zero_for_one else '1->0'} | "
-                        f"{amount_in/1e18:.2f} tokens | {tx_hash.hex()[:10]}... "
-                        f"(Error fetching post-swap state: {e})",
-                        flush=True,
+                    log.info(
+                        "✅ Swap: %s | %.2f tokens | %s... (Error fetching post-swap state: %s)",
+                        "0->1" if zero_for_one else "1->0",
+                        amount_in / 1e18, tx_hash.hex()[:10], e,
                     )
                 return True
             else:
-                print(
-                    f"❌ Swap reverted: {'0->1' if zero_for_one else '1->0'} | Hash: {tx_hash.hex()[:10]}...",
-                    flush=True,
+                log.error(
+                    "❌ Swap reverted: %s | Hash: %s...",
+                    "0->1" if zero_for_one else "1->0", tx_hash.hex()[:10],
                 )
-                try:
-                    pool_key_named = (
-                        self.token0_address, self.token1_address,
-                        self.fee, self.tick_spacing, self.hook_address,
-                    )
-                    self.router.functions.swapExactTokensForTokens(
-                        amount_in_uint256, 0, zero_for_one, pool_key_named, b"",
-                        self.account.address, int(time.time()) + 600,
-                    ).call({"from": self.account.address, "gas": 1000000})
-                except Exception as call_error:
-                    print(f"Revert reason (from call): {call_error}", flush=True)
+                self._log_revert_reason(tx_hash, receipt)
                 return False
 
         except Exception as e:
-            import traceback
-            print(f"Swap failed: {type(e).__name__}: {e}", flush=True)
-            print(f"Traceback: {traceback.format_exc()}", flush=True)
+            log.warning("Swap failed: %s: %s", type(e).__name__, e, exc_info=True)
             return False
 
+    def _log_revert_reason(self, tx_hash, receipt):
+        """Best-effort diagnostics for a reverted swap, run only on failure.
+
+        Prefers debug_traceTransaction: the node replays its stored trace
+        instead of re-simulating the swap against fresh state. Nodes without
+        debug_* fall back to replaying the original calldata with eth_call
+        at the failure block.
+        """
+        try:
+            trace = self.w3.provider.make_request(
+                "debug_traceTransaction", [tx_hash.hex(), {"tracer": "callTracer"}]
+            )
+            result = trace.get("result") or {}
+            reason = result.get("revertReason") or result.get("error")
+            if reason:
+                log.error("Revert reason (from trace): %s", reason)
+                return
+        except Exception:
+            pass
+
+        try:
+            tx = self.w3.eth.get_transaction(tx_hash)
+            self.w3.eth.call(
+                {"from": tx["from"], "to": tx["to"], "data": tx["input"], "gas": tx["gas"]},
+                block_identifier=receipt["blockNumber"],
+            )
+        except Exception as call_error:
+            log.error("Revert reason (from call): %s", call_error)
+
+    def _event_writer(self):
+        """Daemon loop batching tx_events inserts: up to 64 queued rows (or
+        200 ms of arrivals) per transaction, amortizing the journal commit
+        that a per-swap write would pay every time."""
+        conn = sqlite3.connect(store.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        while True:
+            rows = [self._event_q.get()]
+            deadline = time.monotonic() + 0.2
+            while len(rows) < 64:
+                try:
+                    rows.append(self._event_q.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(_TX_EVENT_INSERT_SQL, rows)
+                conn.commit()
+            except Exception as e:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                log.warning("tx_events writer error: %s", e)
+
+    def _swap_reaper(self):
+        """Daemon loop finalizing fire-and-forget swaps queued by the noise
+        trader, keeping receipt waits off the sending thread."""
+        while True:
+            sent = self._pending_swaps.get()
+            try:
+                self._finalize_swap(*sent)
+            except Exception as e:
+                log.warning("Swap finalize error: %s", e)
+
     # ------------------------------------------------------------------
     # Trading strategies
     # ------------------------------------------------------------------
@@ -334,47 +662,75 @@ class SwapBot:
         zero_for_one = pool_price > ext_price
 
         if zero_for_one:
-            base_amount = 1.0 * 1e18
-            max_amount = 5.0 * 1e18
+            base_amount = _BASE_AMOUNT
+            max_amount = _MAX_AMOUNT
         else:
-            base_amount = 1.0 * 1e18 * pool_price
-            max_amount = 5.0 * 1e18 * pool_price
+            # Selling token1: denominate the trade size in token1 terms.
+            base_amount = int(_BASE_AMOUNT * pool_price)
+            max_amount = int(_MAX_AMOUNT * pool_price)
 
         amount = int(base_amount * diff_ratio * 10)
-        min_amount = int(0.01 * 1e18)
-        amount = max(min_amount, min(amount, int(max_amount)))
-        return zero_for_one, amount
+        return zero_for_one, max(_MIN_AMOUNT, min(amount, max_amount))
+
+    def _next_noise_decision(self):
+        """(sleep_s, zero_for_one, amount_wei) from the block-drawn buffers."""
+        i = self._noise_i
+        if i >= len(self._noise_sleeps):
+            self._noise_sleeps = self._rng.uniform(5.0, 15.0, size=1024)
+            self._noise_amounts = self._rng.uniform(0.1, 1.0, size=1024)
+            self._noise_dirs = self._rng.integers(0, 2, size=1024, dtype=np.uint8)
+            i = 0
+        self._noise_i = i + 1
+        return (
+            float(self._noise_sleeps[i]),
+            bool(self._noise_dirs[i]),
+            int(self._noise_amounts[i] * _ONE_E18),
+        )
 
     def run_noise_trader(self):
         """Noise trader: randomly buy and sell."""
         while True:
             try:
-                time.sleep(random.uniform(5, 15))
-                zero_for_one = random.choice([True, False])
-                amount = random.uniform(0.1, 1.0) * 1e18
-                self.execute_swap(zero_for_one, amount)
+                sleep_s, zero_for_one, amount = self._next_noise_decision()
+                time.sleep(sleep_s)
+                # Fire and forget: noise volume does not need to block on the
+                # receipt; the reaper thread finalizes it.
+                sent = self._send_swap(zero_for_one, amount)
+                if sent is not None:
+                    self._pending_swaps.put(sent)
             except Exception as e:
-                print(f"Noise trader error: {e}", flush=True)
+                log.warning("Noise trader error: %s", e)
                 time.sleep(5)
 
     def run_arbitrage_bot(self):
         """Arbitrage bot: close price deviation."""
+        # One persistent read connection for the whole poll loop instead of a
+        # connect/teardown every 3 s. WAL lets this reader run alongside the
+        # monitor's writer without blocking either side.
+        conn = sqlite3.connect(store.db_path, check_same_thread=False, cached_statements=128)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=67108864")
+        cursor = conn.cursor()
+        last_seen_ts = None
+
         while True:
             try:
                 time.sleep(3)
 
-                with sqlite3.connect(store.db_path) as conn:
-                    cursor = conn.cursor()
-                    cursor.execute(
-                        "SELECT pool_price, external_price, pool_liquidity, price_lower, price_upper "
-                        "FROM price_history ORDER BY timestamp DESC LIMIT 1"
-                    )
-                    row = cursor.fetchone()
+                cursor.execute(_LATEST_PRICE_ROW_SQL)
+                row = cursor.fetchone()
 
                 if not row:
                     continue
 
-                pool_price, ext_price, liquidity_raw, price_lower, price_upper = row
+                row_ts, pool_price, ext_price, liquidity_raw, price_lower, price_upper = row
+
+                # The monitor hasn't written a new tick since the last poll;
+                # re-evaluating the same row can only repeat the same trade.
+                if row_ts == last_seen_ts:
+                    continue
+                last_seen_ts = row_ts
                 liquidity = int(float(liquidity_raw) * 1e18) if liquidity_raw is not None else 0
 
                 if liquidity == 0:
@@ -386,19 +742,39 @@ class SwapBot:
 
                 diff_ratio = (pool_price - ext_price) / ext_price
                 THRESHOLD = 0.005
+                HYSTERESIS = 0.001
+                # Must exceed the 3 s poll sleep above, or the interval check
+                # can never trigger and every over-threshold poll trades.
+                MIN_INTERVAL = 10.0
 
                 if abs(diff_ratio) > THRESHOLD:
                     zero_for_one, optimal_amount = self.calculate_optimal_amount(pool_price, ext_price, liquidity)
                     if optimal_amount > 0:
+                        # Hysteresis: repeating the same direction on a
+                        # near-identical deviation just churns fees, and
+                        # back-to-back trades are rate-limited regardless.
+                        now = time.monotonic()
+                        if (
+                            self._last_arb_direction == zero_for_one
+                            and self._last_arb_ratio is not None
+                            and abs(diff_ratio - self._last_arb_ratio) < HYSTERESIS
+                        ):
+                            continue
+                        if now - self._last_arb_ts < MIN_INTERVAL:
+                            continue
+
                         direction = "0->1" if zero_for_one else "1->0"
-                        print(
-                            f"⚖️ Arb: Target={ext_price:.2f} | {direction} | Amount={optimal_amount/1e18:.4f}",
-                            flush=True,
+                        log.info(
+                            "⚖️ Arb: Target=%.2f | %s | Amount=%.4f",
+                            ext_price, direction, optimal_amount / 1e18,
                         )
-                        self.execute_swap(zero_for_one, optimal_amount)
+                        if self.execute_swap(zero_for_one, optimal_amount):
+                            self._last_arb_direction = zero_for_one
+                            self._last_arb_ratio = diff_ratio
+                            self._last_arb_ts = now
 
             except Exception as e:
-                print(f"Arbitrage bot error: {e}", flush=True)
+                log.warning("Arbitrage bot error: %s", e)
                 time.sleep(5)
 
 